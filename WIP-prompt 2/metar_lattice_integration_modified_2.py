@@ -19,47 +19,134 @@ Author: Anduril Industries - Developer Relations
 Date: June 2025
 """
 
+from __future__ import annotations
+
 import asyncio
+import atexit
+import bisect
+import copy
+import hashlib
+import itertools
 import json
 import logging
+import logging.handlers
+import math
 import os
+import queue
+import re
 import sys
-import gzip
-import requests
+import time
+import httpx
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Tuple
-from uuid import uuid4
-import xml.etree.ElementTree as ET
-
-# Lattice SDK imports
-from anduril.entitymanager.v1 import (
-    EntityManagerApiStub, PublishEntityRequest, Aliases,
-    Entity, MilView, Location, Position, Ontology, Template, Provenance,
-    Health, HealthStatus, ComponentHealth, ComponentMessage
-)
-from anduril.ontology.v1 import Disposition, Environment
-from grpclib.client import Channel
+from enum import IntEnum
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+# The Lattice SDK and grpclib are imported where entities are built and sent,
+# so the METAR client and classifiers load without them
+if TYPE_CHECKING:
+    from anduril.entitymanager.v1 import ComponentHealth, EntityManagerApiStub, Entity, HealthStatus, MilView, Provenance
+    from anduril.ontology.v1 import Disposition
+    from grpclib.client import Channel
+
+# Fast JSON decoding, falling back to the standard library
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
-# METAR parsing library
+# Vectorized flight condition classification (optional)
 try:
-    from metar import Metar
+    import numpy as np
 except ImportError:
-    print("Installing METAR parsing library...")
-    os.system("pip install metar")
-    from metar import Metar
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+    np = None
+
+# JIT compilation of the scalar classifier (optional)
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# Faster event loop for the integration's main loop (optional)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Persistent parse cache (optional)
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+# METAR parsing library (see requirements_modified.txt)
+from metar import Metar
+
+# Configure logging (unless the application already has); records are written
+# to stdout by a background thread so a slow terminal never blocks the event loop
+if not logging.getLogger().handlers:
+    _log_queue = queue.SimpleQueue()
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(
+        logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    )
+    _log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+    logging.getLogger().addHandler(logging.handlers.QueueHandler(_log_queue))
+    logging.getLogger().setLevel(logging.INFO)
+
 logger = logging.getLogger(__name__)
 
+class FlightCondition(IntEnum):
+    """Flight condition categories, ordered from worst to best"""
+
+    LIFR = 0
+    IFR = 1
+    MVFR = 2
+    VFR = 3
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __format__(self, format_spec: str) -> str:
+        return format(self.name, format_spec)
+
+# Lattice disposition name for each flight condition, indexed by FlightCondition
+_DISPOSITIONS = (
+    'HOSTILE',           # LIFR
+    'HOSTILE',           # IFR
+    'SUSPICIOUS',        # MVFR
+    'ASSUMED_FRIENDLY',  # VFR
+)
+
+_FLIGHT_CONDITIONS = tuple(FlightCondition)
+
+# The explicit signature makes numba compile at import (or load its on-disk
+# cache) instead of on the first classification
+@njit("int64(float64, float64)", cache=True, fastmath=True)
+def _classify(visibility_miles: float, ceiling_feet: float) -> int:
+    """Return the FlightCondition value for a visibility and ceiling."""
+    # Each threshold met (ceiling AND visibility) raises the category by one:
+    # IFR needs 500 ft / 1 mile, MVFR 1000 ft / 3 miles, VFR 3000 ft / 5 miles
+    return (
+        int(ceiling_feet >= 500 and visibility_miles >= 1)
+        + int(ceiling_feet >= 1000 and visibility_miles >= 3)
+        + int(ceiling_feet >= 3000 and visibility_miles >= 5)
+    )
+
 class FlightConditions:
     """Flight condition classifications based on visibility and ceiling"""
 
+    # Only static methods; never needs per-instance state
+    __slots__ = ()
+
     @staticmethod
-    def determine_flight_conditions(visibility_miles: float, ceiling_feet: Optional[int]) -> str:
+    def determine_flight_conditions(visibility_miles: float, ceiling_feet: Optional[int]) -> FlightCondition:
         """
         Determine flight conditions based on visibility and ceiling.
 
@@ -74,23 +161,47 @@ class FlightConditions:
         if ceiling_feet is None:
             ceiling_feet = 10000
 
-        # LIFR: Ceiling below 500 feet and/or visibility less than 1 mile
-        if ceiling_feet < 500 or visibility_miles < 1:
-            return "LIFR"
+        return _FLIGHT_CONDITIONS[_classify(float(visibility_miles), float(ceiling_feet))]
 
-        # IFR: Ceiling 500-999 feet and/or visibility 1-3 miles
-        if ceiling_feet < 1000 or visibility_miles < 3:
-            return "IFR"
+    @staticmethod
+    def determine_flight_conditions_batch(
+        visibility_miles: Sequence[float],
+        ceiling_feet: Sequence[Optional[float]]
+    ) -> List[FlightCondition]:
+        """
+        Determine flight conditions for many observations at once.
+
+        Uses NumPy when available, otherwise classifies one by one.
+
+        Args:
+            visibility_miles: Visibility in statute miles for each observation
+            ceiling_feet: Ceiling in feet AGL for each observation (None if no ceiling)
 
-        # MVFR: Ceiling 1000-3000 feet and/or visibility 3-5 miles
-        if ceiling_feet < 3000 or visibility_miles < 5:
-            return "MVFR"
+        Returns:
+            Flight condition for each observation, in input order
+        """
+        if np is None:
+            return [
+                FlightConditions.determine_flight_conditions(visibility, ceiling)
+                for visibility, ceiling in zip(visibility_miles, ceiling_feet)
+            ]
+
+        vis = np.asarray(visibility_miles, dtype=np.float64)
+        ceil = np.array(
+            [np.nan if ceiling is None else ceiling for ceiling in ceiling_feet],
+            dtype=np.float64
+        )
+        ceil = np.where(np.isnan(ceil), 10000, ceil)
 
-        # VFR: Ceiling greater than 3000 feet and visibility greater than 5 miles
-        return "VFR"
+        idx = (
+            ((ceil >= 500) & (vis >= 1)).astype(np.int8)
+            + ((ceil >= 1000) & (vis >= 3))
+            + ((ceil >= 3000) & (vis >= 5))
+        )
+        return [_FLIGHT_CONDITIONS[i] for i in idx.tolist()]
 
     @staticmethod
-    def get_disposition_for_condition(flight_condition: str) -> Disposition:
+    def get_disposition_for_condition(flight_condition: FlightCondition) -> Disposition:
         """
         Map flight condition to Lattice disposition.
 
@@ -100,35 +211,335 @@ class FlightConditions:
         Returns:
             Lattice disposition enumeration value
         """
-        if flight_condition == "VFR":
-            return Disposition.ASSUMED_FRIENDLY
-        elif flight_condition == "MVFR":
-            return Disposition.SUSPICIOUS
-        else:  # IFR or LIFR
-            return Disposition.HOSTILE
+        from anduril.ontology.v1 import Disposition
+
+        return Disposition[_DISPOSITIONS[flight_condition]]
+
+class WeatherData(NamedTuple):
+    """Weather observation for one airport, as parsed from its METAR report"""
+
+    icao: str
+    raw_text: str
+    observation_time: Optional[str] = None
+    temperature_c: Optional[float] = None
+    dewpoint_c: Optional[float] = None
+    wind_direction: Optional[float] = None
+    wind_speed_kt: Optional[float] = None
+    visibility_miles: Optional[float] = None
+    pressure_hpa: Optional[float] = None
+    cloud_layers: Sequence[Dict] = ()
+    weather_phenomena: Sequence[str] = ()
+    ceiling_feet: Optional[float] = None
+    flight_condition: Optional[FlightCondition] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        """Return the observation as a plain dictionary (e.g. for JSON output)."""
+        return self._asdict()
+
+# Precompiled METAR groups for the fields the integration uses
+_STATION_RE = re.compile(r"[A-Z][A-Z0-9]{3}")
+_DATETIME_RE = re.compile(r"\d{6}Z")
+_WIND_RE = re.compile(r"(?P<dir>\d{3}|VRB)(?P<speed>\d{2,3})(?:G\d{2,3})?KT")
+_WIND_VARIATION_RE = re.compile(r"\d{3}V\d{3}")
+_VISIBILITY_RE = re.compile(r"[MP]?(?:(?P<whole>\d{1,2})|(?P<num>\d)/(?P<den>\d{1,2}))SM")
+_SKY_RE = re.compile(r"(?P<cover>FEW|SCT|BKN|OVC|VV)(?P<height>\d{3})(?P<cloud>CB|TCU)?")
+_TEMPERATURE_RE = re.compile(r"(?P<temp>M?\d{2})/(?P<dewpt>M?\d{2})")
+_ALTIMETER_RE = re.compile(r"(?P<unit>[AQ])(?P<press>\d{4})")
+_TEMPERATURE_REMARK_RE = re.compile(r"T(?P<tsign>[01])(?P<temp>\d{3})(?:(?P<dsign>[01])(?P<dewpt>\d{3}))?")
+
+def _fast_parse(raw_text: str) -> Optional[Dict]:
+    """
+    Extract the fields used by the integration from a routine METAR.
+
+    Values match what Metar.Metar reports for the same groups. Any group the
+    extractor does not recognize (present weather, RVR, metric visibility,
+    missing values, ...) returns None so the caller can fall back to the
+    full parser.
+
+    Args:
+        raw_text: Raw METAR report text
+
+    Returns:
+        Weather data for the report, or None if it needs the full parser
+    """
+    body, _, remarks = raw_text.partition(" RMK")
+    tokens = body.split()
+    if tokens and tokens[0] in ("METAR", "SPECI"):
+        tokens = tokens[1:]
+    if not tokens or not _STATION_RE.fullmatch(tokens[0]):
+        return None
+
+    weather_data = {
+        'raw_text': raw_text,
+        'temperature_c': None,
+        'dewpoint_c': None,
+        'wind_direction': None,
+        'wind_speed_kt': None,
+        'visibility_miles': None,
+        'pressure_hpa': None,
+        'cloud_layers': [],
+        'weather_phenomena': [],
+        'ceiling_feet': None
+    }
+    seen = set()
+
+    i = 1
+    while i < len(tokens):
+        token = tokens[i]
+        i += 1
+
+        if token in ("AUTO", "COR") or _DATETIME_RE.fullmatch(token) or _WIND_VARIATION_RE.fullmatch(token):
+            continue
+
+        if token in ("CLR", "SKC"):
+            # Metar.Metar reports both as clear
+            weather_data['cloud_layers'].append(
+                {'coverage': 'CLR', 'altitude_ft': None, 'cloud_type': None}
+            )
+            continue
+
+        match = _SKY_RE.fullmatch(token)
+        if match:
+            altitude_ft = float(int(match['height']) * 100)
+            weather_data['cloud_layers'].append({
+                'coverage': match['cover'],
+                'altitude_ft': altitude_ft,
+                'cloud_type': match['cloud']
+            })
+            # Ceiling is the lowest broken or overcast layer
+            if match['cover'] in ('BKN', 'OVC'):
+                ceiling_feet = weather_data['ceiling_feet']
+                if ceiling_feet is None or altitude_ft < ceiling_feet:
+                    weather_data['ceiling_feet'] = altitude_ft
+            continue
+
+        if token.isdigit() and len(token) == 1 and i < len(tokens):
+            # Whole miles followed by a fraction, e.g. "1 1/2SM"
+            match = _VISIBILITY_RE.fullmatch(tokens[i])
+            if not match or not match['num'] or 'vis' in seen:
+                return None
+            seen.add('vis')
+            weather_data['visibility_miles'] = int(token) + int(match['num']) / int(match['den'])
+            i += 1
+            continue
+
+        for group, pattern in (('wind', _WIND_RE), ('vis', _VISIBILITY_RE),
+                               ('temp', _TEMPERATURE_RE), ('press', _ALTIMETER_RE)):
+            match = pattern.fullmatch(token)
+            if match:
+                break
+        else:
+            return None
+
+        if group in seen:
+            return None
+        seen.add(group)
+
+        if group == 'wind':
+            if match['dir'] != 'VRB':
+                weather_data['wind_direction'] = float(match['dir'])
+            weather_data['wind_speed_kt'] = float(match['speed'])
+        elif group == 'vis':
+            if match['whole']:
+                weather_data['visibility_miles'] = float(match['whole'])
+            else:
+                weather_data['visibility_miles'] = int(match['num']) / int(match['den'])
+        elif group == 'temp':
+            weather_data['temperature_c'] = float(match['temp'].replace('M', '-'))
+            weather_data['dewpoint_c'] = float(match['dewpt'].replace('M', '-'))
+        elif match['unit'] == 'A':
+            # Altimeter in inches of mercury, as reported by Metar.Metar
+            weather_data['pressure_hpa'] = int(match['press']) / 100
+        else:
+            weather_data['pressure_hpa'] = float(match['press'])
+
+    # The hourly temperature remark carries tenths of a degree
+    for token in remarks.split():
+        match = _TEMPERATURE_REMARK_RE.fullmatch(token)
+        if match:
+            temp = int(match['temp']) / 10
+            weather_data['temperature_c'] = -temp if match['tsign'] == '1' else temp
+            if match['dewpt']:
+                dewpt = int(match['dewpt']) / 10
+                weather_data['dewpoint_c'] = -dewpt if match['dsign'] == '1' else dewpt
+            break
+
+    return weather_data
+
+# Shared HTTP client so polls reuse the keep-alive (HTTP/2) connection to the API
+_SHARED_CLIENT: Optional[httpx.AsyncClient] = None
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared async HTTP client, creating it on first use."""
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is None or _SHARED_CLIENT.is_closed:
+        _SHARED_CLIENT = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=4,
+                max_connections=8,
+                keepalive_expiry=300
+            ),
+            headers={
+                "User-Agent": "Anduril-Lattice-METAR-Integration/1.0",
+                "Accept": "application/json",
+                "Accept-Encoding": "gzip, deflate"
+            }
+        )
+    return _SHARED_CLIENT
+
+async def _close_client() -> None:
+    """Close the shared async HTTP client if it is open."""
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is not None:
+        await _SHARED_CLIENT.aclose()
+        _SHARED_CLIENT = None
+
+class _RateLimiter:
+    """Enforces a minimum interval between requests to the same API endpoint"""
+
+    def __init__(self, min_interval_seconds: float = 60.0):
+        self.min_interval_seconds = min_interval_seconds
+        self._last_request: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, endpoint: str) -> None:
+        """Wait until the endpoint may be called again, then record the call."""
+        async with self._lock:
+            last_request = self._last_request.get(endpoint)
+            if last_request is not None:
+                delay = last_request + self.min_interval_seconds - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            self._last_request[endpoint] = time.monotonic()
 
 class MetarApiClient:
     """Client for fetching METAR data from aviation weather APIs"""
 
-    def __init__(self, api_base_url: str = "https://aviationweather.gov/api/data"):
-        self.api_base_url = api_base_url
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "Anduril-Lattice-METAR-Integration/1.0"
-        })
+    # The API returns at most 400 entries per response; with hours=1 a station
+    # can report more than once, so stay well under that cap.
+    MAX_STATIONS_PER_REQUEST = 300
+
+    # Number of parsed reports kept in memory (a few cycles of every station)
+    PARSE_CACHE_SIZE = 256
 
-    def get_metar_data(self, icao_codes: List[str], timeout: int = 30) -> Dict[str, Dict]:
+    # Number of stations whose latest report is kept for cache_ttl seconds
+    RESPONSE_CACHE_SIZE = 128
+
+    def __init__(
+        self,
+        api_base_url: str = "https://aviationweather.gov/api/data",
+        cache_ttl: float = 60.0,
+        disk_cache_dir: str = "~/.cache/metar"
+    ):
+        self.api_base_url = api_base_url
+        self.cache_ttl = cache_ttl
+        self.disk_cache_dir = disk_cache_dir
+        # aviationweather.gov asks that no endpoint be polled more than once a minute
+        self._limiter = _RateLimiter(min_interval_seconds=60.0)
+        # (fetch time, report) per station, least recently used first
+        self._response_cache: OrderedDict[str, Tuple[float, WeatherData]] = OrderedDict()
+        self._parse_cache: Dict[str, Dict] = {}
+        # Opened on first use, and left disabled if it cannot be opened
+        self._disk_cache = None
+        self._disk_cache_disabled = diskcache is None
+
+    @property
+    def session(self) -> httpx.AsyncClient:
+        """Shared HTTP client used for all API requests"""
+        return _get_client()
+
+    def _get_disk_cache(self):
+        """Return the persistent parse cache, opening it on first use."""
+        if self._disk_cache is None and not self._disk_cache_disabled:
+            try:
+                self._disk_cache = diskcache.Cache(os.path.expanduser(self.disk_cache_dir))
+            except Exception as e:
+                logger.warning("Disk cache disabled, cannot open %s: %s", self.disk_cache_dir, e)
+                self._disk_cache_disabled = True
+        return self._disk_cache
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and the disk cache."""
+        await _close_client()
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+            self._disk_cache = None
+
+    def get_metar_data(self, icao_codes: List[str], timeout: int = 30) -> Dict[str, WeatherData]:
         """
         Retrieve METAR data for the specified ICAO airport codes.
 
+        Synchronous wrapper around get_metar_data_async for callers that are
+        not running inside an event loop.
+
         Args:
             icao_codes: List of ICAO airport codes
             timeout: Request timeout in seconds
 
         Returns:
-            Dictionary mapping ICAO codes to weather data
+            Dictionary mapping ICAO codes to WeatherData records
         """
+        async def _fetch() -> Dict[str, WeatherData]:
+            try:
+                return await self.get_metar_data_async(icao_codes, timeout)
+            finally:
+                await self.aclose()
+
+        return asyncio.run(_fetch())
+
+    async def get_metar_data_async(self, icao_codes: List[str], timeout: int = 30) -> Dict[str, WeatherData]:
+        """
+        Retrieve METAR data for the specified ICAO airport codes without
+        blocking the event loop.
+
+        Each station's report is reused for cache_ttl seconds; the remaining
+        codes are sent in a single request (split only when exceeding
+        MAX_STATIONS_PER_REQUEST).
+
+        Args:
+            icao_codes: List of ICAO airport codes
+            timeout: Request timeout in seconds
+
+        Returns:
+            Dictionary mapping ICAO codes to WeatherData records
+        """
+        now = time.monotonic()
+        results = {}
+        missing = []
+        for icao in icao_codes:
+            icao = icao.upper()
+            cached = self._response_cache.get(icao)
+            if cached is not None and now - cached[0] < self.cache_ttl:
+                self._response_cache.move_to_end(icao)
+                results[icao] = cached[1]
+            else:
+                missing.append(icao)
+
+        for start in range(0, len(missing), self.MAX_STATIONS_PER_REQUEST):
+            batch = missing[start:start + self.MAX_STATIONS_PER_REQUEST]
+            fetched = await self._fetch_metar_batch(batch, timeout)
+
+            fetched_at = time.monotonic()
+            for icao, weather_data in fetched.items():
+                self._response_cache[icao] = (fetched_at, weather_data)
+                self._response_cache.move_to_end(icao)
+            results.update(fetched)
+
+        # Keep only the most recently used stations
+        while len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+
+        return results
+
+    async def _fetch_metar_batch(self, icao_codes: List[str], timeout: int) -> Dict[str, WeatherData]:
+        """Fetch one batch of ICAO codes from the METAR endpoint."""
+        assert len(icao_codes) <= self.MAX_STATIONS_PER_REQUEST
+
         try:
+            await self._limiter.acquire("/metar")
+
             params = {
                 'ids': ','.join(icao_codes),
                 'format': 'json',
@@ -136,310 +547,532 @@ class MetarApiClient:
                 'hours': '1'
             }
 
-            response = self.session.get(
+            response = await self.session.get(
                 f"{self.api_base_url}/metar",
                 params=params,
                 timeout=timeout
             )
             response.raise_for_status()
 
-            data = response.json()
-            results = {}
+            return self._parse_metar_entries(_json_loads(response.content))
 
-            for metar_entry in data:
-                icao = metar_entry.get('icaoId', '').upper()
-                raw_text = metar_entry.get('rawOb', '')
+        except Exception as e:
+            logger.error("Error fetching METAR data: %s", e)
+            return {}
 
-                if not icao or not raw_text:
-                    continue
+    def _parse_metar_entries(self, data: List[Dict]) -> Dict[str, WeatherData]:
+        """Parse the METAR entries returned by the API, keyed by ICAO code."""
+        results = {}
+        parsed = []
 
-                try:
-                    # Parse the METAR text
-                    parsed_metar = Metar.Metar(raw_text)
-
-                    # Extract weather data
-                    weather_data = {
-                        'icao': icao,
-                        'raw_text': raw_text,
-                        'observation_time': metar_entry.get('obsTime'),
-                        'temperature_c': parsed_metar.temp.value() if parsed_metar.temp else None,
-                        'dewpoint_c': parsed_metar.dewpt.value() if parsed_metar.dewpt else None,
-                        'wind_direction': parsed_metar.wind_dir.value() if parsed_metar.wind_dir else None,
-                        'wind_speed_kt': parsed_metar.wind_speed.value() if parsed_metar.wind_speed else None,
-                        'visibility_miles': parsed_metar.vis.value() if parsed_metar.vis else None,
-                        'pressure_hpa': parsed_metar.press.value() if parsed_metar.press else None,
-                        'cloud_layers': self._parse_cloud_layers(parsed_metar),
-                        'weather_phenomena': [str(wx) for wx in parsed_metar.weather] if parsed_metar.weather else []
-                    }
-
-                    # Calculate flight conditions
-                    ceiling_feet = self._get_ceiling_feet(weather_data['cloud_layers'])
-                    visibility_miles = weather_data['visibility_miles'] or 10.0
-
-                    weather_data['ceiling_feet'] = ceiling_feet
-                    weather_data['flight_condition'] = FlightConditions.determine_flight_conditions(
-                        visibility_miles, ceiling_feet
-                    )
-
-                    results[icao] = weather_data
+        # A station can report more than once in the requested hour (e.g. a
+        # SPECI after the routine METAR); only its latest report is parsed
+        latest = {}
+        for metar_entry in data:
+            # Interned so lookups against the airport table's (literal, already
+            # interned) keys hit the identity fast path
+            icao = sys.intern(metar_entry.get('icaoId', '').upper())
+            if not icao or not metar_entry.get('rawOb'):
+                continue
 
-                except Exception as e:
-                    logger.error(f"Error parsing METAR for {icao}: {e}")
-                    results[icao] = {'error': str(e), 'raw_text': raw_text}
+            current = latest.get(icao)
+            if current is None or (metar_entry.get('obsTime') or 0) > (current.get('obsTime') or 0):
+                latest[icao] = metar_entry
 
-            return results
+        for icao, metar_entry in latest.items():
+            raw_text = metar_entry['rawOb']
 
-        except Exception as e:
-            logger.error(f"Error fetching METAR data: {e}")
-            return {}
+            try:
+                weather_data = WeatherData(
+                    icao=icao,
+                    observation_time=metar_entry.get('obsTime'),
+                    **self._parse_metar(raw_text)
+                )
+
+                results[icao] = weather_data
+                parsed.append(weather_data)
+
+            except Exception as e:
+                logger.error("Error parsing METAR for %s: %s", icao, e)
+                results[icao] = WeatherData(icao=icao, raw_text=raw_text, error=str(e))
+
+        # Calculate flight conditions for all parsed reports in one pass
+        conditions = FlightConditions.determine_flight_conditions_batch(
+            [weather_data.visibility_miles or 10.0 for weather_data in parsed],
+            [weather_data.ceiling_feet for weather_data in parsed]
+        )
+        for weather_data, condition in zip(parsed, conditions):
+            results[weather_data.icao] = weather_data._replace(flight_condition=condition)
+
+        return results
+
+    def _parse_metar(self, raw_text: str) -> Dict:
+        """
+        Parse a raw METAR report into weather data.
+
+        Reports are cached by content, so a station whose observation has not
+        changed since the last poll is not parsed again.
+
+        Args:
+            raw_text: Raw METAR report text
 
-    def _parse_cloud_layers(self, metar: 'Metar.Metar') -> List[Dict]:
-        """Parse cloud layer information from METAR."""
+        Returns:
+            Parsed fields for the report, as WeatherData keyword arguments
+        """
+        cache_key = hashlib.blake2b(raw_text.encode(), digest_size=16).hexdigest()
+
+        disk_cache = self._get_disk_cache()
+        weather_data = self._parse_cache.get(cache_key)
+        if weather_data is None and disk_cache is not None:
+            weather_data = disk_cache.get(cache_key)
+        if weather_data is not None:
+            return weather_data
+
+        # Extract the needed fields directly, using the full parser only for
+        # reports the fast path does not understand
+        weather_data = _fast_parse(raw_text)
+        if weather_data is None:
+            parsed_metar = Metar.Metar(raw_text)
+            cloud_layers, ceiling_feet = self._parse_clouds_and_ceiling(parsed_metar)
+
+            weather_data = {
+                'raw_text': raw_text,
+                'temperature_c': parsed_metar.temp.value() if parsed_metar.temp else None,
+                'dewpoint_c': parsed_metar.dewpt.value() if parsed_metar.dewpt else None,
+                'wind_direction': parsed_metar.wind_dir.value() if parsed_metar.wind_dir else None,
+                'wind_speed_kt': parsed_metar.wind_speed.value() if parsed_metar.wind_speed else None,
+                'visibility_miles': parsed_metar.vis.value() if parsed_metar.vis else None,
+                'pressure_hpa': parsed_metar.press.value() if parsed_metar.press else None,
+                'cloud_layers': cloud_layers,
+                'weather_phenomena': [str(wx) for wx in parsed_metar.weather] if parsed_metar.weather else [],
+                'ceiling_feet': ceiling_feet
+            }
+
+        if len(self._parse_cache) >= self.PARSE_CACHE_SIZE:
+            # Evict the oldest entry; dicts preserve insertion order
+            del self._parse_cache[next(iter(self._parse_cache))]
+        self._parse_cache[cache_key] = weather_data
+        if disk_cache is not None:
+            disk_cache.set(cache_key, weather_data, expire=3600)
+
+        return weather_data
+
+    def _parse_clouds_and_ceiling(self, metar: 'Metar.Metar') -> Tuple[List[Dict], Optional[float]]:
+        """
+        Parse cloud layers from METAR and determine the ceiling in the same pass.
+
+        The ceiling is the lowest broken or overcast layer, regardless of the
+        order the layers appear in the report.
+
+        Returns:
+            Tuple of (cloud layers, ceiling in feet or None)
+        """
         layers = []
+        ceiling_feet = None
         for layer in metar.sky:
-            layer_info = {
+            altitude_ft = layer[1].value() if layer[1] else None
+            layers.append({
                 'coverage': layer[0],
-                'altitude_ft': layer[1].value() if layer[1] else None,
+                'altitude_ft': altitude_ft,
                 'cloud_type': layer[2] if len(layer) > 2 else None
-            }
-            layers.append(layer_info)
-        return layers
-
-    def _get_ceiling_feet(self, cloud_layers: List[Dict]) -> Optional[int]:
-        """Determine ceiling height from cloud layers."""
-        ceiling_coverages = ['BKN', 'OVC']  # Broken or Overcast
-        for layer in cloud_layers:
-            if layer['coverage'] in ceiling_coverages and layer['altitude_ft']:
-                return layer['altitude_ft']
-        return None
+            })
+            if layer[0] in ('BKN', 'OVC') and altitude_ft is not None:
+                if ceiling_feet is None or altitude_ft < ceiling_feet:
+                    ceiling_feet = altitude_ft
+        return layers, ceiling_feet
+
+# Static airport database, built once at import and shared read-only
+_AIRPORT_RECORDS = {
+    # Massachusetts
+    'KBOS': {
+        'name': 'General Edward Lawrence Logan International Airport',
+        'city': 'Boston',
+        'state': 'MA',
+        'lat': 42.3656132,
+        'lon': -71.0095602,
+        'type': 'major'
+    },
+    'KORH': {
+        'name': 'Worcester Regional Airport',
+        'city': 'Worcester',
+        'state': 'MA',
+        'lat': 42.2673056,
+        'lon': -71.8757222,
+        'type': 'regional'
+    },
+    'KBED': {
+        'name': 'Laurence G. Hanscom Field',
+        'city': 'Bedford',
+        'state': 'MA',
+        'lat': 42.4699167,
+        'lon': -71.2889722,
+        'type': 'municipal'
+    },
+    'KACK': {
+        'name': 'Nantucket Memorial Airport',
+        'city': 'Nantucket',
+        'state': 'MA',
+        'lat': 41.2530556,
+        'lon': -70.0597222,
+        'type': 'regional'
+    },
+    'KMVT': {
+        'name': "Martha's Vineyard Airport",
+        'city': "Vineyard Haven",
+        'state': 'MA',
+        'lat': 41.3931389,
+        'lon': -70.6144444,
+        'type': 'regional'
+    },
+    'KHYA': {
+        'name': 'Barnstable Municipal Airport',
+        'city': 'Hyannis',
+        'state': 'MA',
+        'lat': 41.6693333,
+        'lon': -70.2802778,
+        'type': 'municipal'
+    },
+
+    # New Hampshire
+    'KMHT': {
+        'name': 'Manchester-Boston Regional Airport',
+        'city': 'Manchester',
+        'state': 'NH',
+        'lat': 42.9346511,
+        'lon': -71.4375794,
+        'type': 'major'
+    },
+    'KLEB': {
+        'name': 'Lebanon Municipal Airport',
+        'city': 'Lebanon',
+        'state': 'NH',
+        'lat': 43.6261111,
+        'lon': -72.3041667,
+        'type': 'municipal'
+    },
+    'KCON': {
+        'name': 'Concord Municipal Airport',
+        'city': 'Concord',
+        'state': 'NH',
+        'lat': 43.2027778,
+        'lon': -71.5019444,
+        'type': 'municipal'
+    },
+
+    # Connecticut
+    'KBDL': {
+        'name': 'Bradley International Airport',
+        'city': 'Hartford/Windsor Locks',
+        'state': 'CT',
+        'lat': 41.9388889,
+        'lon': -72.6833333,
+        'type': 'major'
+    },
+    'KHVN': {
+        'name': 'Tweed New Haven Airport',
+        'city': 'New Haven',
+        'state': 'CT',
+        'lat': 41.2637222,
+        'lon': -72.8869444,
+        'type': 'regional'
+    },
+    'KGON': {
+        'name': 'Groton-New London Airport',
+        'city': 'Groton',
+        'state': 'CT',
+        'lat': 41.3301389,
+        'lon': -72.0451389,
+        'type': 'municipal'
+    },
+
+    # Rhode Island
+    'KPVD': {
+        'name': 'Theodore Francis Green Airport',
+        'city': 'Providence/Warwick',
+        'state': 'RI',
+        'lat': 41.7251944,
+        'lon': -71.4283333,
+        'type': 'major'
+    },
+
+    # Vermont
+    'KBTV': {
+        'name': 'Patrick Leahy Burlington International Airport',
+        'city': 'Burlington',
+        'state': 'VT',
+        'lat': 44.4719444,
+        'lon': -73.1533333,
+        'type': 'major'
+    },
+    'KMPV': {
+        'name': 'Edward F. Knapp State Airport',
+        'city': 'Montpelier',
+        'state': 'VT',
+        'lat': 44.2055556,
+        'lon': -72.5633333,
+        'type': 'municipal'
+    },
+
+    # Maine
+    'KBGR': {
+        'name': 'Bangor International Airport',
+        'city': 'Bangor',
+        'state': 'ME',
+        'lat': 44.8073889,
+        'lon': -68.8281667,
+        'type': 'major'
+    },
+    'KPWM': {
+        'name': 'Portland International Jetport',
+        'city': 'Portland',
+        'state': 'ME',
+        'lat': 43.6461111,
+        'lon': -70.3093056,
+        'type': 'major'
+    },
+    'KAUG': {
+        'name': 'Augusta State Airport',
+        'city': 'Augusta',
+        'state': 'ME',
+        'lat': 44.3206111,
+        'lon': -69.7972222,
+        'type': 'municipal'
+    },
+    'KBHB': {
+        'name': 'Hancock County-Bar Harbor Airport',
+        'city': 'Bar Harbor',
+        'state': 'ME',
+        'lat': 44.4497778,
+        'lon': -68.3616667,
+        'type': 'municipal'
+    }
+}
+
+_AIRPORTS: Mapping[str, Mapping[str, object]] = MappingProxyType({
+    icao: MappingProxyType(info) for icao, info in _AIRPORT_RECORDS.items()
+})
+
+def _build_airport_columns(records: Mapping[str, Mapping[str, object]]) -> Dict[str, Sequence]:
+    """Build a column-per-field copy of the airport records, as NumPy arrays when available."""
+    fields = ('name', 'city', 'state', 'lat', 'lon', 'type')
+    columns = {'icao': list(records)}
+    columns.update({field: [info[field] for info in records.values()] for field in fields})
+
+    if np is None:
+        return {field: tuple(values) for field, values in columns.items()}
+
+    return {
+        'icao': np.array(columns['icao'], dtype='<U4'),
+        'name': np.array(columns['name']),
+        'city': np.array(columns['city']),
+        'state': np.array(columns['state'], dtype='<U2'),
+        'lat': np.array(columns['lat'], dtype=np.float64),
+        'lon': np.array(columns['lon'], dtype=np.float64),
+        'type': np.array(columns['type'], dtype='<U10'),
+    }
+
+# Columnar (struct-of-arrays) view of the same table for vectorized joins
+_AIRPORT_COLUMNS = _build_airport_columns(_AIRPORTS)
+_AIRPORT_INDEX = {icao: i for i, icao in enumerate(_AIRPORTS)}
 
 class NewEnglandAirports:
     """Database of New England airports with their information"""
 
     @staticmethod
-    def get_airports() -> Dict[str, Dict]:
-        """Return dictionary of New England airports"""
-        return {
-            # Massachusetts
-            'KBOS': {
-                'name': 'General Edward Lawrence Logan International Airport',
-                'city': 'Boston',
-                'state': 'MA',
-                'lat': 42.3656132,
-                'lon': -71.0095602,
-                'type': 'major'
-            },
-            'KORH': {
-                'name': 'Worcester Regional Airport',
-                'city': 'Worcester',
-                'state': 'MA',
-                'lat': 42.2673056,
-                'lon': -71.8757222,
-                'type': 'regional'
-            },
-            'KBED': {
-                'name': 'Laurence G. Hanscom Field',
-                'city': 'Bedford',
-                'state': 'MA',
-                'lat': 42.4699167,
-                'lon': -71.2889722,
-                'type': 'municipal'
-            },
-            'KACK': {
-                'name': 'Nantucket Memorial Airport',
-                'city': 'Nantucket',
-                'state': 'MA',
-                'lat': 41.2530556,
-                'lon': -70.0597222,
-                'type': 'regional'
-            },
-            'KMVT': {
-                'name': "Martha's Vineyard Airport",
-                'city': "Vineyard Haven",
-                'state': 'MA',
-                'lat': 41.3931389,
-                'lon': -70.6144444,
-                'type': 'regional'
-            },
-            'KHYA': {
-                'name': 'Barnstable Municipal Airport',
-                'city': 'Hyannis',
-                'state': 'MA',
-                'lat': 41.6693333,
-                'lon': -70.2802778,
-                'type': 'municipal'
-            },
-
-            # New Hampshire
-            'KMHT': {
-                'name': 'Manchester-Boston Regional Airport',
-                'city': 'Manchester',
-                'state': 'NH',
-                'lat': 42.9346511,
-                'lon': -71.4375794,
-                'type': 'major'
-            },
-            'KLEB': {
-                'name': 'Lebanon Municipal Airport',
-                'city': 'Lebanon',
-                'state': 'NH',
-                'lat': 43.6261111,
-                'lon': -72.3041667,
-                'type': 'municipal'
-            },
-            'KCON': {
-                'name': 'Concord Municipal Airport',
-                'city': 'Concord',
-                'state': 'NH',
-                'lat': 43.2027778,
-                'lon': -71.5019444,
-                'type': 'municipal'
-            },
-
-            # Connecticut
-            'KBDL': {
-                'name': 'Bradley International Airport',
-                'city': 'Hartford/Windsor Locks',
-                'state': 'CT',
-                'lat': 41.9388889,
-                'lon': -72.6833333,
-                'type': 'major'
-            },
-            'KHVN': {
-                'name': 'Tweed New Haven Airport',
-                'city': 'New Haven',
-                'state': 'CT',
-                'lat': 41.2637222,
-                'lon': -72.8869444,
-                'type': 'regional'
-            },
-            'KGON': {
-                'name': 'Groton-New London Airport',
-                'city': 'Groton',
-                'state': 'CT',
-                'lat': 41.3301389,
-                'lon': -72.0451389,
-                'type': 'municipal'
-            },
-
-            # Rhode Island
-            'KPVD': {
-                'name': 'Theodore Francis Green Airport',
-                'city': 'Providence/Warwick',
-                'state': 'RI',
-                'lat': 41.7251944,
-                'lon': -71.4283333,
-                'type': 'major'
-            },
-
-            # Vermont
-            'KBTV': {
-                'name': 'Patrick Leahy Burlington International Airport',
-                'city': 'Burlington',
-                'state': 'VT',
-                'lat': 44.4719444,
-                'lon': -73.1533333,
-                'type': 'major'
-            },
-            'KMPV': {
-                'name': 'Edward F. Knapp State Airport',
-                'city': 'Montpelier',
-                'state': 'VT',
-                'lat': 44.2055556,
-                'lon': -72.5633333,
-                'type': 'municipal'
-            },
-
-            # Maine
-            'KBGR': {
-                'name': 'Bangor International Airport',
-                'city': 'Bangor',
-                'state': 'ME',
-                'lat': 44.8073889,
-                'lon': -68.8281667,
-                'type': 'major'
-            },
-            'KPWM': {
-                'name': 'Portland International Jetport',
-                'city': 'Portland',
-                'state': 'ME',
-                'lat': 43.6461111,
-                'lon': -70.3093056,
-                'type': 'major'
-            },
-            'KAUG': {
-                'name': 'Augusta State Airport',
-                'city': 'Augusta',
-                'state': 'ME',
-                'lat': 44.3206111,
-                'lon': -69.7972222,
-                'type': 'municipal'
-            },
-            'KBHB': {
-                'name': 'Hancock County-Bar Harbor Airport',
-                'city': 'Bar Harbor',
-                'state': 'ME',
-                'lat': 44.4497778,
-                'lon': -68.3616667,
-                'type': 'municipal'
-            }
-        }
+    def get_airports() -> Mapping[str, Mapping[str, object]]:
+        """
+        Return the New England airports keyed by ICAO code.
+
+        The mapping is shared and read-only; callers that need to modify an
+        entry should copy it first, e.g. dict(airports[icao]).
+        """
+        return _AIRPORTS
+
+    @staticmethod
+    def bulk_join(icao_codes: Sequence[str]) -> Dict[str, Sequence]:
+        """
+        Look up airport columns for many ICAO codes at once.
+
+        Args:
+            icao_codes: ICAO codes to join against the airport table; unknown
+                codes are skipped
+
+        Returns:
+            Dictionary of columns (icao, name, city, state, lat, lon, type)
+            aligned with the known codes, as NumPy arrays when available
+        """
+        rows = [_AIRPORT_INDEX[icao] for icao in icao_codes if icao in _AIRPORT_INDEX]
+
+        if np is None:
+            return {field: [column[i] for i in rows] for field, column in _AIRPORT_COLUMNS.items()}
 
+        return {field: column[rows] for field, column in _AIRPORT_COLUMNS.items()}
+
+
+# Health status names for each weather parameter. Threshold bands are looked
+# up with bisect: a value equal to a threshold falls in the band above it for
+# bisect_right and below it for bisect_left.
+_CONDITION_HEALTH = {
+    FlightCondition.VFR: 'HEALTHY',
+    FlightCondition.MVFR: 'WARN',
+    FlightCondition.IFR: 'FAIL',
+    FlightCondition.LIFR: 'FAIL',
+}
+
+# FAIL below -20 and above 40 C, WARN below -10 and above 35 C; the upper
+# bounds are inclusive, hence the next float up
+_TEMPERATURE_THRESHOLDS = (-20.0, -10.0, math.nextafter(35.0, math.inf), math.nextafter(40.0, math.inf))
+_TEMPERATURE_HEALTH = ('FAIL', 'WARN', 'HEALTHY', 'WARN', 'FAIL')
+
+# WARN above 15 kt, FAIL above 30 kt
+_WIND_THRESHOLDS = (15.0, 30.0)
+_WIND_HEALTH = ('HEALTHY', 'WARN', 'FAIL')
+
+# FAIL below 1 mile, WARN below 5 miles
+_VISIBILITY_THRESHOLDS = (1.0, 5.0)
+_VISIBILITY_HEALTH = ('FAIL', 'WARN', 'HEALTHY')
 
 class LatticeWeatherIntegration:
     """Main class for integrating METAR weather data with Lattice"""
 
+    # Maximum number of entity publishes in flight at once
+    MAX_CONCURRENT_PUBLISHES = 8
+
+    # Health component per weather parameter:
+    # (WeatherData attribute, component id suffix, name, status helper, message)
+    _HEALTH_COMPONENTS = (
+        ('flight_condition', 'flight_condition', "Flight Condition", '_get_health_status_for_condition',
+         lambda value: f"Current flight condition: {value}"),
+        ('temperature_c', 'temperature', "Temperature", '_get_health_status_for_temperature',
+         lambda value: f"Current temperature: {value:.1f}°C ({value * 9/5 + 32:.1f}°F)"),
+        ('wind_speed_kt', 'wind_speed', "Wind Speed", '_get_health_status_for_wind',
+         lambda value: f"Current wind speed: {value} knots"),
+        ('visibility_miles', 'visibility', "Visibility", '_get_health_status_for_visibility',
+         lambda value: f"Current visibility: {value} miles"),
+    )
+
+    # HTTP/2 keepalive ping interval for the gRPC channel, in seconds
+    KEEPALIVE_SECONDS = 300.0
+
+    # Unchanged reports are republished after this long, well inside the
+    # two-hour entity expiry, and at most this many are remembered
+    ENTITY_REFRESH_SECONDS = 3600.0
+    ENTITY_CACHE_SIZE = 64
+
     def __init__(
         self,
         lattice_url: str = None,
         environment_token: str = None,
         sandboxes_token: str = None,
-        update_interval_minutes: int = 30
+        update_interval_minutes: int = 30,
+        pool_size: int = 4
     ):
         # Get configuration from environment if not provided
         self.lattice_url = lattice_url or os.getenv('LATTICE_URL')
         self.environment_token = environment_token or os.getenv('ENVIRONMENT_TOKEN')
         self.sandboxes_token = sandboxes_token or os.getenv('SANDBOXES_TOKEN')
         self.update_interval_minutes = update_interval_minutes
+        self.pool_size = max(1, pool_size)
 
         # Initialize clients
         self.metar_client = MetarApiClient()
         self.airports = NewEnglandAirports.get_airports()
+        self._icao_codes = list(self.airports)
+
+        # Static entity fields per airport; only weather fields change per poll
+        self._entity_templates: Dict[str, Entity] = {
+            icao: self._build_entity_template(icao, airport)
+            for icao, airport in self.airports.items()
+        }
+
+        # Health component ids per airport, in _HEALTH_COMPONENTS order
+        self._component_ids: Dict[str, Tuple[str, ...]] = {
+            icao: self._build_component_ids(icao) for icao in self.airports
+        }
+
+        # Classification for each flight condition, shared by all entities in it
+        self._mil_views = self._build_mil_views()
+
+        # Health status tables resolved to enum members once, so the status
+        # helpers are plain lookups
+        self._build_health_tables()
+
+        # Provenance of the most recent cycle, reused while its timestamp matches
+        self._provenance: Optional[Provenance] = None
+
+        # Last publish time (monotonic) of each (icao, raw METAR), least recent first
+        self._entity_cache: OrderedDict[Tuple[str, str], float] = OrderedDict()
+
+        # Pool of gRPC channels shared by all publishes, created on first use;
+        # calls take them round-robin so concurrent RPCs spread over connections
+        self._channels: List[Channel] = []
+        self._stubs: List[EntityManagerApiStub] = []
+        self._next_stub = itertools.count()
 
         # Validate configuration
         if not self.lattice_url or not self.environment_token:
             logger.error("Missing Lattice configuration. Set LATTICE_URL and ENVIRONMENT_TOKEN environment variables.")
             raise ValueError("Missing Lattice configuration.")
 
-        logger.info(f"Initialized Lattice integration for {len(self.airports)} airports")
+        # Authorization metadata sent with every call
+        self._metadata = {
+            'authorization': f"Bearer {self.environment_token}"
+        }
+
+        # Add sandboxes token if available
+        if self.sandboxes_token:
+            self._metadata['anduril-sandbox-authorization'] = f"Bearer {self.sandboxes_token}"
+
+        logger.info("Initialized Lattice integration for %d airports", len(self.airports))
+
+    async def __aenter__(self) -> "LatticeWeatherIntegration":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
 
     async def start(self):
         """Start the integration loop"""
-        logger.info(f"Starting METAR to Lattice integration with {self.update_interval_minutes}-minute updates")
+        logger.info("Starting METAR to Lattice integration with %s-minute updates", self.update_interval_minutes)
+
+        # Do the TLS handshake at startup rather than in the first cycle
+        await self._warm_up_channel()
+
+        # Schedule cycles on absolute deadlines so the time spent fetching and
+        # publishing does not push every later update back
+        loop = asyncio.get_running_loop()
+        interval_seconds = self.update_interval_minutes * 60
+        next_deadline = loop.time()
 
         while True:
+            next_deadline += interval_seconds
             try:
-                # Get weather data
-                all_icao_codes = list(self.airports.keys())
-                metar_data = self.metar_client.get_metar_data(all_icao_codes)
+                # Get weather data for all airports in one batched request
+                metar_data = await self.metar_client.get_metar_data_async(self._icao_codes)
 
                 if metar_data:
-                    logger.info(f"Successfully retrieved METAR data for {len(metar_data)} airports")
+                    logger.info("Successfully retrieved METAR data for %d airports", len(metar_data))
 
                     # Publish to Lattice
                     entities_published = await self.publish_weather_entities(metar_data)
-                    logger.info(f"Published {entities_published}/{len(self.airports)} weather entities to Lattice")
+                    logger.info("Published %d/%d weather entities to Lattice", entities_published, len(self.airports))
                 else:
                     logger.error("Failed to retrieve any METAR data")
 
             except Exception as e:
-                logger.error(f"Error in integration cycle: {e}")
+                logger.error("Error in integration cycle: %s", e)
 
             # Wait for next update
-            logger.info(f"Waiting {self.update_interval_minutes} minutes until next update...")
-            await asyncio.sleep(self.update_interval_minutes * 60)
-
-    async def publish_weather_entities(self, metar_data: Dict[str, Dict]) -> int:
+            delay = next_deadline - loop.time()
+            if delay > 0:
+                logger.info("Waiting %.1f minutes until next update...", delay / 60)
+                await asyncio.sleep(delay)
+            else:
+                # The cycle overran its interval; yield once and start the next now
+                next_deadline = loop.time()
+                await asyncio.sleep(0)
+
+    async def publish_weather_entities(self, metar_data: Dict[str, WeatherData]) -> int:
         """
         Publish weather entities to Lattice.
 
@@ -449,32 +1082,97 @@ class LatticeWeatherIntegration:
         Returns:
             Number of entities successfully published
         """
-        count = 0
+        # All entities in a cycle share the same timestamps
+        time_now = datetime.now(timezone.utc)
+        expiry_time = time_now + timedelta(hours=2)
+        publish_time = time.monotonic()
 
+        entities = []
+        cache_keys = []
+        unchanged = 0
         for icao, data in metar_data.items():
             try:
                 # Skip if error
-                if 'error' in data:
-                    logger.warning(f"Skipping {icao}: {data['error']}")
+                if data.error:
+                    logger.warning("Skipping %s: %s", icao, data.error)
                     continue
 
                 # Get airport info
                 airport = self.airports.get(icao)
                 if not airport:
-                    logger.warning(f"Skipping unknown airport: {icao}")
+                    logger.warning("Skipping unknown airport: %s", icao)
                     continue
 
-                # Create and publish entity
-                entity = await self.create_weather_entity(icao, airport, data)
-                await self.publish_entity(entity)
-                count += 1
+                # Lattice already has this report; republish only to refresh
+                # the entity before it expires
+                cache_key = (icao, data.raw_text)
+                published_at = self._entity_cache.get(cache_key)
+                if published_at is not None and publish_time - published_at < self.ENTITY_REFRESH_SECONDS:
+                    self._entity_cache.move_to_end(cache_key)
+                    unchanged += 1
+                    continue
+
+                entities.append(
+                    await self.create_weather_entity(icao, airport, data, time_now, expiry_time)
+                )
+                cache_keys.append(cache_key)
 
             except Exception as e:
-                logger.error(f"Error publishing weather entity for {icao}: {e}")
+                logger.error("Error creating weather entity for %s: %s", icao, e)
 
-        return count
+        if unchanged:
+            logger.info("Skipped %d weather entities with unchanged METAR reports", unchanged)
+        if not entities:
+            return 0
 
-    async def create_weather_entity(self, icao: str, airport: Dict, weather: Dict) -> Entity:
+        # Send the whole batch over one client stream; if the stream is
+        # rejected, fall back to concurrent unary calls
+        try:
+            await self.publish_entities(entities)
+            self._mark_published(cache_keys, publish_time)
+            return len(entities)
+        except Exception as e:
+            logger.warning("Streaming publish failed, publishing individually: %s", e)
+
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_PUBLISHES)
+
+        async def _publish(entity: Entity) -> bool:
+            async with semaphore:
+                try:
+                    await self.publish_entity(entity)
+                    return True
+                except Exception as e:
+                    logger.error("Error publishing weather entity %s: %s", entity.entity_id, e)
+                    return False
+
+        # Publish all entities concurrently over the shared channel
+        results = await asyncio.gather(
+            *(_publish(entity) for entity in entities),
+            return_exceptions=True
+        )
+        self._mark_published(
+            [key for key, result in zip(cache_keys, results) if result is True],
+            publish_time
+        )
+
+        return sum(1 for result in results if result is True)
+
+    def _mark_published(self, cache_keys: List[Tuple[str, str]], publish_time: float) -> None:
+        """Record when each (icao, raw METAR) entity was published, evicting the least recent"""
+        for cache_key in cache_keys:
+            self._entity_cache[cache_key] = publish_time
+            self._entity_cache.move_to_end(cache_key)
+        while len(self._entity_cache) > self.ENTITY_CACHE_SIZE:
+            self._entity_cache.popitem(last=False)
+
+    async def create_weather_entity(
+        self,
+        icao: str,
+        airport: Dict,
+        weather: WeatherData,
+        time_now: Optional[datetime] = None,
+        expiry_time: Optional[datetime] = None
+    ) -> Entity:
         """
         Create a Lattice entity for an airport with weather data.
 
@@ -482,105 +1180,82 @@ class LatticeWeatherIntegration:
             icao: ICAO code of the airport
             airport: Airport information
             weather: Weather data for the airport
+            time_now: Creation and source update time (defaults to now)
+            expiry_time: Entity expiry time (defaults to two hours after time_now)
 
         Returns:
             Lattice entity representing the airport's weather
         """
-        # Calculate timestamps
-        time_now = datetime.now(timezone.utc)
-        expiry_time = time_now + timedelta(hours=2)
+        from anduril.entitymanager.v1 import Provenance, Health
+
+        # Calculate timestamps unless the caller shares them across a cycle
+        if time_now is None:
+            time_now = datetime.now(timezone.utc)
+        if expiry_time is None:
+            expiry_time = time_now + timedelta(hours=2)
 
         # Format description including flight condition
-        flight_condition = weather.get('flight_condition', 'Unknown')
-        temperature_c = weather.get('temperature_c')
-        temperature_f = None if temperature_c is None else (temperature_c * 9/5) + 32
+        flight_condition = weather.flight_condition
         description = f"{airport['name']} ({icao}) - {flight_condition}"
 
-        # Get disposition based on flight condition
-        disposition = FlightConditions.get_disposition_for_condition(flight_condition)
-
-        # Health components for each weather parameter
-        health_components = []
-
-        # Flight condition health component
-        if flight_condition:
-            condition_status = self._get_health_status_for_condition(flight_condition)
-            health_components.append(
-                ComponentHealth(
-                    id=f"{icao}_flight_condition",
-                    name="Flight Condition",
-                    health=condition_status,
-                    messages=[
-                        ComponentMessage(
-                            message=f"Current flight condition: {flight_condition}",
-                            status=condition_status
-                        )
-                    ]
-                )
+        # Health components for each weather parameter that was reported,
+        # built in one pass with no per-component appends
+        component_ids = self._component_ids.get(icao) or self._build_component_ids(icao)
+        health_components = [
+            self._make_component(component_id, name, getattr(self, status_helper)(value), message(value))
+            for component_id, (attribute, _, name, status_helper, message) in zip(
+                component_ids, self._HEALTH_COMPONENTS
             )
+            if (value := getattr(weather, attribute)) is not None
+        ]
 
-        # Temperature health component
-        if temperature_c is not None:
-            temp_status = self._get_health_status_for_temperature(temperature_c)
-            health_components.append(
-                ComponentHealth(
-                    id=Entity.entity_id, # f"{icao}_temperature",
-                    name="Temperature",
-                    health=temp_status,
-                    messages=[
-                        ComponentMessage(
-                            message=f"Current temperature: {temperature_c:.1f}°C ({temperature_f:.1f}°F)",
-                            status=temp_status
-                        )
-                    ]
-                )
-            )
+        # Overall health status based on flight condition
+        overall_health_status = self._get_health_status_for_condition(flight_condition)
 
-        # Wind speed health component
-        wind_speed = weather.get('wind_speed_kt')
-        if wind_speed is not None:
-            wind_status = self._get_health_status_for_wind(wind_speed)
-            health_components.append(
-                ComponentHealth(
-                    id=Entity.entity_id, # f"{icao}_wind_speed",
-                    name="Wind Speed",
-                    health=wind_status,
-                    messages=[
-                        ComponentMessage(
-                            message=f"Current wind speed: {wind_speed} knots",
-                            status=wind_status
-                        )
-                    ]
-                )
-            )
+        # Start from the airport's static template and fill in the weather
+        template = self._entity_templates.get(icao) or self._build_entity_template(icao, airport)
+        entity = copy.copy(template)
+        entity.description = description
+        entity.created_time = time_now
+        entity.expiry_time = expiry_time
 
-        # Visibility health component
-        visibility = weather.get('visibility_miles')
-        if visibility is not None:
-            visibility_status = self._get_health_status_for_visibility(visibility)
-            health_components.append(
-                ComponentHealth(
-                    id=Entity.entity_id, # f"{icao}_visibility",
-                    name="Visibility",
-                    health=visibility_status,
-                    messages=[
-                        ComponentMessage(
-                            message=f"Current visibility: {visibility} miles",
-                            status=visibility_status
-                        )
-                    ]
-                )
+        # Classification, with disposition based on flight condition
+        entity.mil_view = self._mil_views[flight_condition]
+
+        # Health status
+        entity.health = Health(
+            health_status=overall_health_status,
+            components=health_components
+        )
+
+        # Metadata, shared by every entity stamped with the same time
+        provenance = self._provenance
+        if provenance is None or provenance.source_update_time != time_now:
+            provenance = self._provenance = Provenance(
+                integration_name="METAR-Weather-Integration",
+                data_type="aviation_weather",
+                source_update_time=time_now
             )
+        entity.provenance = provenance
 
-        # Overall health status based on flight condition
-        overall_health_status = self._get_health_status_for_condition(flight_condition)
+        return entity
+
+    def _build_entity_template(self, icao: str, airport: Mapping[str, object]) -> Entity:
+        """
+        Build the weather-independent part of an airport's entity.
+
+        Args:
+            icao: ICAO code of the airport
+            airport: Airport information
+
+        Returns:
+            Entity with the static identification, location and type fields set
+        """
+        from anduril.entitymanager.v1 import Aliases, Entity, Location, Ontology, Position, Template
 
-        # Create entity
-        entity = Entity(
+        return Entity(
+            # Deterministic per airport, so every poll updates the same entity
             entity_id=f"weather_{icao}",
-            description=description,
-            created_time=time_now,
-            expiry_time=expiry_time,
             is_live=True,
 
             # Identification
@@ -596,74 +1271,106 @@ class LatticeWeatherIntegration:
                 )
             ),
 
-            # Classification
-            mil_view=MilView(
-                # Set disposition based on flight condition
-                disposition=disposition,
-                environment=Environment.AIR
-            ),
-
             # Type
             ontology=Ontology(
                 template=Template.SENSOR_POINT_OF_INTEREST,
                 platform_type="RADAR"  # Using RADAR for weather station
-            ),
+            )
+        )
 
-            # Health status
-            health=Health(
-                health_status=overall_health_status,
-                components=health_components
-            ),
+    @staticmethod
+    def _make_component(component_id: str, name: str, status: HealthStatus, message: str) -> ComponentHealth:
+        """Build a health component carrying a single message with the component's status"""
+        from anduril.entitymanager.v1 import ComponentHealth, ComponentMessage
+
+        return ComponentHealth(
+            id=component_id,
+            name=name,
+            health=status,
+            messages=[ComponentMessage(message=message, status=status)]
+        )
 
-            # Metadata
-            provenance=Provenance(
-                integration_name="METAR-Weather-Integration",
-                data_type="aviation_weather",
-                source_update_time=time_now
+    def _build_component_ids(self, icao: str) -> Tuple[str, ...]:
+        """Build an airport's health component ids, e.g. KBOS_temperature"""
+        return tuple(f"{icao}_{id_suffix}" for _, id_suffix, *_ in self._HEALTH_COMPONENTS)
+
+    @staticmethod
+    def _build_mil_views() -> Tuple[MilView, ...]:
+        """Build the MilView for each flight condition, indexed by FlightCondition"""
+        from anduril.entitymanager.v1 import MilView
+        from anduril.ontology.v1 import Environment
+
+        return tuple(
+            MilView(
+                disposition=FlightConditions.get_disposition_for_condition(condition),
+                environment=Environment.AIR
             )
+            for condition in FlightCondition
         )
 
-        return entity
+    def _build_health_tables(self) -> None:
+        """Resolve the module's health status names to HealthStatus members"""
+        from anduril.entitymanager.v1 import HealthStatus
 
-    def _get_health_status_for_condition(self, condition: str) -> HealthStatus:
+        self._health_offline = HealthStatus.OFFLINE
+        self._condition_health = {
+            condition: HealthStatus[name] for condition, name in _CONDITION_HEALTH.items()
+        }
+        self._temperature_health = tuple(HealthStatus[name] for name in _TEMPERATURE_HEALTH)
+        self._wind_health = tuple(HealthStatus[name] for name in _WIND_HEALTH)
+        self._visibility_health = tuple(HealthStatus[name] for name in _VISIBILITY_HEALTH)
+
+    def _get_health_status_for_condition(self, condition: FlightCondition) -> HealthStatus:
         """Map flight condition to health status"""
-        if condition == "VFR":
-            return HealthStatus.HEALTHY
-        elif condition == "MVFR":
-            return HealthStatus.WARN
-        elif condition == "IFR":
-            return HealthStatus.FAIL
-        elif condition == "LIFR":
-            return HealthStatus.FAIL
-        else:
-            return HealthStatus.OFFLINE
+        return self._condition_health.get(condition, self._health_offline)
 
     def _get_health_status_for_temperature(self, temp_c: float) -> HealthStatus:
         """Map temperature to health status"""
-        if temp_c < -20 or temp_c > 40:
-            return HealthStatus.FAIL
-        elif temp_c < -10 or temp_c > 35:
-            return HealthStatus.WARN
-        else:
-            return HealthStatus.HEALTHY
+        return self._temperature_health[bisect.bisect_right(_TEMPERATURE_THRESHOLDS, temp_c)]
 
     def _get_health_status_for_wind(self, wind_kt: float) -> HealthStatus:
         """Map wind speed to health status"""
-        if wind_kt > 30:
-            return HealthStatus.ERROR
-        elif wind_kt > 15:
-            return HealthStatus.WARN
-        else:
-            return HealthStatus.HEALTHY
+        return self._wind_health[bisect.bisect_left(_WIND_THRESHOLDS, wind_kt)]
 
     def _get_health_status_for_visibility(self, visibility_miles: float) -> HealthStatus:
         """Map visibility to health status"""
-        if visibility_miles < 1:
-            return HealthStatus.FAIL
-        elif visibility_miles < 5:
-            return HealthStatus.WARN
-        else:
-            return HealthStatus.HEALTHY
+        return self._visibility_health[bisect.bisect_right(_VISIBILITY_THRESHOLDS, visibility_miles)]
+
+    def _get_stub(self) -> EntityManagerApiStub:
+        """Return the next Entity Manager stub in the pool, opening the channels on first use"""
+        if not self._stubs:
+            from anduril.entitymanager.v1 import EntityManagerApiStub
+            from grpclib.client import Channel
+            from grpclib.config import Configuration
+
+            # Ping the idle connection between polls so it survives the gap
+            # instead of paying a new TLS handshake every cycle
+            config = Configuration(
+                _keepalive_time=self.KEEPALIVE_SECONDS,
+                _keepalive_permit_without_calls=True,
+                _http2_max_pings_without_data=0
+            )
+
+            # Each channel is its own TCP connection; grpclib multiplexes
+            # concurrent calls on a channel as HTTP/2 streams
+            self._channels = [
+                Channel(host=self.lattice_url, port=443, ssl=True, config=config)
+                for _ in range(self.pool_size)
+            ]
+            self._stubs = [EntityManagerApiStub(channel) for channel in self._channels]
+        return self._stubs[next(self._next_stub) % len(self._stubs)]
+
+    async def _warm_up_channel(self) -> None:
+        """Open the pool's gRPC connections ahead of the first publish"""
+        self._get_stub()
+        results = await asyncio.gather(
+            *(channel.__connect__() for channel in self._channels),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                # The first publish on that channel will retry the connection
+                logger.warning("Could not pre-connect to Lattice: %s", result)
 
     async def publish_entity(self, entity: Entity) -> None:
         """
@@ -672,47 +1379,62 @@ class LatticeWeatherIntegration:
         Args:
             entity: Entity to publish
         """
-        try:
-            # Set up gRPC channel
-            channel = Channel(host=self.lattice_url, port=443, ssl=True)
-            stub = EntityManagerApiStub(channel)
+        from anduril.entitymanager.v1 import PublishEntityRequest
 
-            # Prepare metadata
-            metadata = {
-                'authorization': f"Bearer {self.environment_token}"
-            }
-
-            # Add sandboxes token if available
-            if self.sandboxes_token:
-                metadata['anduril-sandbox-authorization'] = f"Bearer {self.sandboxes_token}"
+        try:
+            stub = self._get_stub()
 
             # Create request
             request = PublishEntityRequest(entity=entity)
 
             # Send request
-            await stub.publish_entity(request, metadata=metadata)
-
-            # Close channel
-            channel.close()
+            await stub.publish_entity(request, metadata=self._metadata)
 
         except Exception as e:
-            logger.error(f"Error publishing entity: {e}")
+            logger.error("Error publishing entity: %s", e)
             raise
 
+    async def publish_entities(self, entities: Sequence[Entity]) -> None:
+        """
+        Publish several entities to Lattice over a single client stream.
+
+        Args:
+            entities: Entities to publish
+        """
+        from anduril.entitymanager.v1 import PublishEntitiesRequest
+
+        stub = self._get_stub()
+        await stub.publish_entities(
+            (PublishEntitiesRequest(entity=entity) for entity in entities),
+            metadata=self._metadata
+        )
+
+    async def close(self) -> None:
+        """Close the gRPC channel pool and the shared METAR HTTP client"""
+        for channel in self._channels:
+            channel.close()
+        self._channels = []
+        self._stubs = []
+        await self.metar_client.aclose()
+
 async def main():
     """Main entry point"""
     try:
-        # Create and start integration
-        integration = LatticeWeatherIntegration()
-        await integration.start()
+        # One integration, event loop, channel pool and HTTP client for the
+        # life of the process; closed when the loop exits
+        async with LatticeWeatherIntegration() as integration:
+            await integration.start()
     except KeyboardInterrupt:
         logger.info("Integration stopped by user")
     except Exception as e:
-        logger.error(f"Integration error: {e}")
+        logger.error("Integration error: %s", e)
         sys.exit(1)
 
 if __name__ == "__main__":
     print("METAR to Lattice Weather Integration")
     print("=" * 50)
     print()
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -25,6 +25,8 @@ class MockDisposition:
 
 # Mock the SDK classes for testing
 class MockComponentHealth:
+    __slots__ = ('id', 'name', 'health', 'messages')
+
     def __init__(self, id, name, health, messages):
         self.id = id
         self.name = name
@@ -32,6 +34,8 @@ class MockComponentHealth:
         self.messages = messages
 
 class MockComponentMessage:
+    __slots__ = ('message', 'status')
+
     def __init__(self, message, status):
         self.message = message
         self.status = status
@@ -1,9 +1,3 @@
-import plotly.graph_objects as go
-import plotly.io as pio
-
-# Create a technical architecture diagram as a flowchart
-fig = go.Figure()
-
 # Define positions for components (x, y coordinates)
 # Data Sources (left side)
 faa_api_pos = (1, 8)
@@ -50,29 +44,34 @@ components = [
     {"name": "Real-time Mon", "pos": monitoring_pos, "color": "#5D878F", "width": 1.3, "height": 0.5},
 ]
 
+# Shapes and annotations are collected here and set on the layout in one
+# update, rather than validated and merged into the figure one at a time
+shapes = []
+annotations = []
+
 # Add component boxes
 for comp in components:
     x, y = comp["pos"]
     w, h = comp["width"], comp["height"]
     
     # Add rectangle
-    fig.add_shape(
+    shapes.append(dict(
         type="rect",
         x0=x-w/2, y0=y-h/2, x1=x+w/2, y1=y+h/2,
         fillcolor=comp["color"],
         line=dict(color="black", width=1),
         opacity=0.8
-    )
+    ))
     
     # Add text
-    fig.add_annotation(
+    annotations.append(dict(
         x=x, y=y,
         text=comp["name"],
         showarrow=False,
         font=dict(size=10, color="black"),
         xanchor="center",
         yanchor="middle"
-    )
+    ))
 
 # Define arrows for data flow
 arrows = [
@@ -106,7 +105,7 @@ for arrow in arrows:
     end_x, end_y = arrow["end"]
     
     # Add arrow
-    fig.add_annotation(
+    annotations.append(dict(
         x=end_x, y=end_y,
         ax=start_x, ay=start_y,
         arrowhead=2,
@@ -114,13 +113,13 @@ for arrow in arrows:
         arrowwidth=2,
         arrowcolor="black",
         axref="x", ayref="y"
-    )
+    ))
     
     # Add label if provided
     if arrow["label"]:
         mid_x = (start_x + end_x) / 2
         mid_y = (start_y + end_y) / 2
-        fig.add_annotation(
+        annotations.append(dict(
             x=mid_x, y=mid_y + 0.1,
             text=arrow["label"],
             showarrow=False,
@@ -128,60 +127,50 @@ for arrow in arrows:
             bgcolor="white",
             bordercolor="black",
             borderwidth=1
-        )
+        ))
 
 # Add section headers
-fig.add_annotation(
-    x=1, y=9,
-    text="Data Sources",
-    showarrow=False,
-    font=dict(size=12, color="black", family="Arial Black"),
-    xanchor="center"
-)
+for x, text in [(1, "Data Sources"), (3.5, "Processing"), (6, "Integration"), (8.5, "Lattice Platform")]:
+    annotations.append(dict(
+        x=x, y=9,
+        text=text,
+        showarrow=False,
+        font=dict(size=12, color="black", family="Arial Black"),
+        xanchor="center"
+    ))
 
-fig.add_annotation(
-    x=3.5, y=9,
-    text="Processing",
-    showarrow=False,
-    font=dict(size=12, color="black", family="Arial Black"),
-    xanchor="center"
-)
+def render():
+    """Render the architecture diagram to metar_lattice_architecture.png"""
+    # Plotly is only imported when rendering
+    import plotly.graph_objects as go
 
-fig.add_annotation(
-    x=6, y=9,
-    text="Integration",
-    showarrow=False,
-    font=dict(size=12, color="black", family="Arial Black"),
-    xanchor="center"
-)
+    # Create a technical architecture diagram as a flowchart
+    fig = go.Figure()
 
-fig.add_annotation(
-    x=8.5, y=9,
-    text="Lattice Platform",
-    showarrow=False,
-    font=dict(size=12, color="black", family="Arial Black"),
-    xanchor="center"
-)
+    # Update layout
+    fig.update_layout(
+        title="METAR to Lattice Integration System",
+        xaxis=dict(
+            range=[0, 10],
+            showgrid=False,
+            showticklabels=False,
+            zeroline=False
+        ),
+        yaxis=dict(
+            range=[3.5, 9.5],
+            showgrid=False,
+            showticklabels=False,
+            zeroline=False
+        ),
+        showlegend=False,
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        shapes=shapes,
+        annotations=annotations
+    )
 
-# Update layout
-fig.update_layout(
-    title="METAR to Lattice Integration System",
-    xaxis=dict(
-        range=[0, 10],
-        showgrid=False,
-        showticklabels=False,
-        zeroline=False
-    ),
-    yaxis=dict(
-        range=[3.5, 9.5],
-        showgrid=False,
-        showticklabels=False,
-        zeroline=False
-    ),
-    showlegend=False,
-    plot_bgcolor="white",
-    paper_bgcolor="white"
-)
+    # Save the chart
+    fig.write_image("metar_lattice_architecture.png", format="png")
 
-# Save the chart
-fig.write_image("metar_lattice_architecture.png")
\ No newline at end of file
+if __name__ == "__main__":
+    render()
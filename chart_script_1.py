@@ -1,7 +1,3 @@
-import pandas as pd
-import plotly.graph_objects as go
-import json
-
 # Parse the data
 data = {
   "airports": [
@@ -27,9 +23,6 @@ data = {
   ]
 }
 
-# Convert to DataFrame
-df = pd.DataFrame(data["airports"])
-
 # Define colors for states (using brand colors)
 state_colors = {
     'MA': '#1FB8CD',  # Strong cyan
@@ -48,9 +41,7 @@ type_symbols = {
 }
 
 # Create abbreviated names for display (under 15 chars)
-def abbreviate_name(name):
-    if len(name) <= 15:
-        return name
+def abbreviate_names(names):
     # Common abbreviations
     abbrevs = {
         'International': 'Intl',
@@ -63,118 +54,125 @@ def abbreviate_name(name):
         'Memorial': 'Mem',
         'County': 'Co'
     }
-    result = name
+    result = names
     for full, abbrev in abbrevs.items():
-        result = result.replace(full, abbrev)
-    if len(result) > 15:
-        result = result[:12] + "..."
-    return result
-
-def abbreviate_city(city):
-    if len(city) <= 12:
-        return city
-    return city[:9] + "..."
-
-df['display_name'] = df['name'].apply(abbreviate_name)
-df['display_city'] = df['city'].apply(abbreviate_city)
-
-# Create grid positions for better spacing
-state_order = ['ME', 'NH', 'VT', 'MA', 'RI', 'CT']
-x_positions = {state: i for i, state in enumerate(state_order)}
-
-# Assign positions within each state column
-df['x_pos'] = df['state'].map(x_positions)
-df['y_pos'] = 0
-
-# Create y positions with better spacing
-for state in state_order:
-    state_airports = df[df['state'] == state].sort_values(['major', 'type'], ascending=[False, True])
-    for i, idx in enumerate(state_airports.index):
-        df.loc[idx, 'y_pos'] = -i * 0.8  # Better vertical spacing
-
-# Create the figure
-fig = go.Figure()
-
-# Add traces by state and major status for cleaner legend
-for state in state_order:
-    state_data = df[df['state'] == state]
+        result = result.str.replace(full, abbrev, regex=False)
+    result = result.where(result.str.len() <= 15, result.str[:12] + "...")
+    return names.where(names.str.len() <= 15, result)
+
+def abbreviate_cities(cities):
+    return cities.where(cities.str.len() <= 12, cities.str[:9] + "...")
+
+def render():
+    """Render the airport coverage chart to new_england_airports.png"""
+    # pandas and Plotly are only imported when rendering
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    # Convert to DataFrame
+    df = pd.DataFrame(data["airports"])
+
+    df['display_name'] = abbreviate_names(df['name'])
+    df['display_city'] = abbreviate_cities(df['city'])
+
+    # Create grid positions for better spacing
+    state_order = ['ME', 'NH', 'VT', 'MA', 'RI', 'CT']
+    x_positions = {state: i for i, state in enumerate(state_order)}
+
+    # Assign positions within each state column
+    df['x_pos'] = df['state'].map(x_positions)
+
+    # Create y positions with better spacing: major airports first, then by type
+    ranked = df.sort_values(['state', 'major', 'type'], ascending=[True, False, True], kind='stable')
+    df['y_pos'] = -ranked.groupby('state').cumcount() * 0.8  # Better vertical spacing
+
+    # Create the figure
+    fig = go.Figure()
+
+    # Add traces by state and major status for cleaner legend
+    for state in state_order:
+        state_data = df[df['state'] == state]
     
-    if len(state_data) == 0:
-        continue
+        if len(state_data) == 0:
+            continue
     
-    # Major airports
-    major_data = state_data[state_data['major'] == True]
-    if len(major_data) > 0:
-        fig.add_trace(go.Scatter(
-            x=major_data['x_pos'],
-            y=major_data['y_pos'],
-            mode='markers+text',
-            marker=dict(
-                size=25,
-                color=state_colors[state],
-                symbol=[type_symbols[t] for t in major_data['type']],
-                line=dict(width=3, color='black')
-            ),
-            text=major_data['icao'],
-            textposition='top center',
-            textfont=dict(size=10, color='black'),
-            hovertext=[f"{row['icao']} - {row['display_name']}<br>({row['display_city']})<br>Type: {row['type']}<br>Status: Major" 
-                      for _, row in major_data.iterrows()],
-            hoverinfo='text',
-            name=f"{state} Major",
-            showlegend=True,
-            cliponaxis=False
-        ))
+        # Major airports
+        major_data = state_data[state_data['major'] == True]
+        if len(major_data) > 0:
+            fig.add_trace(go.Scatter(
+                x=major_data['x_pos'],
+                y=major_data['y_pos'],
+                mode='markers+text',
+                marker=dict(
+                    size=25,
+                    color=state_colors[state],
+                    symbol=major_data['type'].map(type_symbols).tolist(),
+                    line=dict(width=3, color='black')
+                ),
+                text=major_data['icao'],
+                textposition='top center',
+                textfont=dict(size=10, color='black'),
+                hovertext=(major_data['icao'] + " - " + major_data['display_name'] + "<br>(" + major_data['display_city']
+                           + ")<br>Type: " + major_data['type'] + "<br>Status: Major").tolist(),
+                hoverinfo='text',
+                name=f"{state} Major",
+                showlegend=True,
+                cliponaxis=False
+            ))
     
-    # Regular airports
-    regular_data = state_data[state_data['major'] == False]
-    if len(regular_data) > 0:
-        fig.add_trace(go.Scatter(
-            x=regular_data['x_pos'],
-            y=regular_data['y_pos'],
-            mode='markers+text',
-            marker=dict(
-                size=15,
-                color=state_colors[state],
-                symbol=[type_symbols[t] for t in regular_data['type']],
-                line=dict(width=1, color='gray')
-            ),
-            text=regular_data['icao'],
-            textposition='top center',
-            textfont=dict(size=8, color='black'),
-            hovertext=[f"{row['icao']} - {row['display_name']}<br>({row['display_city']})<br>Type: {row['type']}" 
-                      for _, row in regular_data.iterrows()],
-            hoverinfo='text',
-            name=f"{state} Regular",
-            showlegend=True,
-            cliponaxis=False
-        ))
-
-# Update layout
-fig.update_layout(
-    title="New England METAR Coverage",
-    xaxis_title="States",
-    yaxis_title="",
-    xaxis=dict(
-        tickmode='array',
-        tickvals=list(range(len(state_order))),
-        ticktext=[f"{state}\n({len(df[df['state']==state])} airports)" for state in state_order],
-        showgrid=False,
-        range=[-0.5, len(state_order)-0.5]
-    ),
-    yaxis=dict(
-        showticklabels=False, 
-        showgrid=False,
-        range=[df['y_pos'].min()-0.5, df['y_pos'].max()+1]
-    ),
-    hovermode='closest',
-    showlegend=True,
-    plot_bgcolor='white'
-)
-
-# Update axes
-fig.update_xaxes(tickangle=0)
-fig.update_yaxes(showticklabels=False)
-
-# Save the chart
-fig.write_image("new_england_airports.png")
\ No newline at end of file
+        # Regular airports
+        regular_data = state_data[state_data['major'] == False]
+        if len(regular_data) > 0:
+            fig.add_trace(go.Scatter(
+                x=regular_data['x_pos'],
+                y=regular_data['y_pos'],
+                mode='markers+text',
+                marker=dict(
+                    size=15,
+                    color=state_colors[state],
+                    symbol=regular_data['type'].map(type_symbols).tolist(),
+                    line=dict(width=1, color='gray')
+                ),
+                text=regular_data['icao'],
+                textposition='top center',
+                textfont=dict(size=8, color='black'),
+                hovertext=(regular_data['icao'] + " - " + regular_data['display_name'] + "<br>(" + regular_data['display_city']
+                           + ")<br>Type: " + regular_data['type']).tolist(),
+                hoverinfo='text',
+                name=f"{state} Regular",
+                showlegend=True,
+                cliponaxis=False
+            ))
+
+    # Update layout
+    state_counts = df['state'].value_counts()
+    fig.update_layout(
+        title="New England METAR Coverage",
+        xaxis_title="States",
+        yaxis_title="",
+        xaxis=dict(
+            tickmode='array',
+            tickvals=list(range(len(state_order))),
+            ticktext=[f"{state}\n({state_counts.get(state, 0)} airports)" for state in state_order],
+            showgrid=False,
+            range=[-0.5, len(state_order)-0.5]
+        ),
+        yaxis=dict(
+            showticklabels=False, 
+            showgrid=False,
+            range=[df['y_pos'].min()-0.5, df['y_pos'].max()+1]
+        ),
+        hovermode='closest',
+        showlegend=True,
+        plot_bgcolor='white'
+    )
+
+    # Update axes
+    fig.update_xaxes(tickangle=0)
+    fig.update_yaxes(showticklabels=False)
+
+    # Save the chart
+    fig.write_image("new_england_airports.png")
+
+if __name__ == "__main__":
+    render()
@@ -12,25 +12,49 @@ Date: June 2025
 """
 
 import asyncio
+import copy
+import csv
+import functools
+import hashlib
+import io
 import json
 import logging
+import math
 import os
+import random
+import re
+import signal
 import sys
+import time
 import gzip
-import requests
+import httpx
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Tuple
-from uuid import uuid4
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 import xml.etree.ElementTree as ET
 
 # Lattice SDK imports
 from anduril.entitymanager.v1 import (
-    EntityManagerApiStub, PublishEntityRequest, Aliases,
+    EntityManagerApiStub, PublishEntityRequest, PublishEntitiesRequest, Aliases,
     Entity, MilView, Location, Position, Ontology, Template, Provenance
 )
 from anduril.ontology.v1 import Disposition, Environment
 from grpclib.client import Channel
 
+# Fast JSON decoding, falling back to the standard library
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Vectorized airport queries (optional)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # METAR parsing library
 try:
     from metar import Metar
@@ -46,14 +70,142 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=32)
+def _join_icao_codes(icao_codes: Tuple[str, ...]) -> str:
+    """Comma-separated ICAO list for the API 'ids' parameter, cached per code set"""
+    return ",".join(icao_codes)
+
+# Precompiled METAR groups for the fields the integration reads
+_STATION_RE = re.compile(r"[A-Z][A-Z0-9]{3}")
+_DATETIME_RE = re.compile(r"\d{6}Z")
+_WIND_RE = re.compile(r"(?P<dir>\d{3}|VRB)(?P<speed>\d{2,3})(?:G\d{2,3})?KT")
+_WIND_VARIATION_RE = re.compile(r"\d{3}V\d{3}")
+_VISIBILITY_RE = re.compile(r"[MP]?(?:(?P<whole>\d{1,2})|(?P<num>\d)/(?P<den>\d{1,2}))SM")
+_SKY_RE = re.compile(r"(?P<cover>FEW|SCT|BKN|OVC|VV)(?P<height>\d{3})(?:CB|TCU)?")
+_TEMPERATURE_RE = re.compile(r"(?P<temp>M?\d{2})/(?P<dewpt>M?\d{2})")
+_ALTIMETER_RE = re.compile(r"(?P<unit>[AQ])(?P<press>\d{4})")
+_TEMPERATURE_REMARK_RE = re.compile(r"T(?P<tsign>[01])(?P<temp>\d{3})(?:(?P<dsign>[01])(?P<dewpt>\d{3}))?")
+
+_MB_PER_INHG = 33.86398
+
+def _fast_parse_metar(raw_text: str) -> Optional[Dict]:
+    """
+    Extract wind, visibility, sky, temperature and pressure from a routine METAR
+
+    Values match what Metar.Metar reports for the same groups. Reports with
+    any other group (present weather, RVR, metric visibility, ...) return
+    None so the caller can fall back to the full parser.
+
+    Args:
+        raw_text: Raw METAR report text
+
+    Returns:
+        Parsed fields, or None if the report needs the full parser
+    """
+    body, _, remarks = raw_text.partition(" RMK")
+    tokens = body.split()
+    if tokens and tokens[0] in ("METAR", "SPECI"):
+        tokens = tokens[1:]
+    if not tokens or not _STATION_RE.fullmatch(tokens[0]):
+        return None
+
+    fields = {
+        'temperature_c': None,
+        'dewpoint_c': None,
+        'wind_direction': None,
+        'wind_speed_kt': None,
+        'visibility_miles': None,
+        'pressure_mb': None,
+        'sky_layers': [],
+    }
+
+    for token in tokens[1:]:
+        if token in ("AUTO", "COR") or _DATETIME_RE.fullmatch(token) or _WIND_VARIATION_RE.fullmatch(token):
+            continue
+
+        if token in ("CLR", "SKC"):
+            # Metar.Metar reports both as clear
+            fields['sky_layers'].append(('CLR', None))
+            continue
+
+        match = _SKY_RE.fullmatch(token)
+        if match:
+            fields['sky_layers'].append((match['cover'], float(int(match['height']) * 100)))
+            continue
+
+        match = _WIND_RE.fullmatch(token)
+        if match and fields['wind_speed_kt'] is None:
+            if match['dir'] != 'VRB':
+                fields['wind_direction'] = float(match['dir'])
+            fields['wind_speed_kt'] = float(match['speed'])
+            continue
+
+        match = _VISIBILITY_RE.fullmatch(token)
+        if match and fields['visibility_miles'] is None:
+            if match['whole']:
+                fields['visibility_miles'] = float(match['whole'])
+            else:
+                fields['visibility_miles'] = int(match['num']) / int(match['den'])
+            continue
+
+        match = _TEMPERATURE_RE.fullmatch(token)
+        if match and fields['temperature_c'] is None:
+            fields['temperature_c'] = float(match['temp'].replace('M', '-'))
+            fields['dewpoint_c'] = float(match['dewpt'].replace('M', '-'))
+            continue
+
+        match = _ALTIMETER_RE.fullmatch(token)
+        if match and fields['pressure_mb'] is None:
+            if match['unit'] == 'A':
+                fields['pressure_mb'] = int(match['press']) / 100 * _MB_PER_INHG
+            else:
+                fields['pressure_mb'] = float(match['press'])
+            continue
+
+        return None
+
+    # The hourly temperature remark carries tenths of a degree
+    for token in remarks.split():
+        match = _TEMPERATURE_REMARK_RE.fullmatch(token)
+        if match:
+            temp = int(match['temp']) / 10
+            fields['temperature_c'] = -temp if match['tsign'] == '1' else temp
+            # The dewpoint half is omitted when no dewpoint was measured
+            if match['dewpt']:
+                dewpt = int(match['dewpt']) / 10
+                fields['dewpoint_c'] = -dewpt if match['dsign'] == '1' else dewpt
+            break
+
+    return fields
+
 class FlightConditions:
     """Flight condition classifications based on visibility and ceiling"""
 
+    # Only static methods; never needs per-instance state
+    __slots__ = ()
+
+    # Thresholds below which conditions drop one category: MVFR, IFR, LIFR
+    _CEILING_THRESHOLDS = (3000, 1000, 500)
+    _VISIBILITY_THRESHOLDS = (5, 3, 1)
+
+    # _TABLE[ceiling bucket][visibility bucket]; bucket 0 is VFR, 3 is LIFR, and
+    # the worse of the two buckets decides the condition
+    _TABLE = (
+        ("VFR", "MVFR", "IFR", "LIFR"),
+        ("MVFR", "MVFR", "IFR", "LIFR"),
+        ("IFR", "IFR", "IFR", "LIFR"),
+        ("LIFR", "LIFR", "LIFR", "LIFR"),
+    )
+
     @staticmethod
+    @functools.lru_cache(maxsize=4096)
     def determine_flight_conditions(visibility_miles: float, ceiling_feet: Optional[int]) -> str:
         """
         Determine flight conditions based on visibility and ceiling.
 
+        Reported values come from a small set (visibility in quarter miles,
+        ceilings in hundreds of feet), so results are memoized per pair.
+
         Args:
             visibility_miles: Visibility in statute miles
             ceiling_feet: Ceiling in feet AGL (Above Ground Level)
@@ -65,21 +217,42 @@ class FlightConditions:
         if ceiling_feet is None:
             ceiling_feet = 10000
 
-        # LIFR: Ceiling < 500' and/or visibility < 1 mile
-        if ceiling_feet < 500 or visibility_miles < 1:
-            return "LIFR"
+        # LIFR: ceiling < 500' or visibility < 1 mile; IFR: < 1000' or < 3 miles;
+        # MVFR: < 3000' or < 5 miles; otherwise VFR
+        ceiling_bucket = (ceiling_feet < 3000) + (ceiling_feet < 1000) + (ceiling_feet < 500)
+        visibility_bucket = (visibility_miles < 5) + (visibility_miles < 3) + (visibility_miles < 1)
+        return FlightConditions._TABLE[ceiling_bucket][visibility_bucket]
+
+    @staticmethod
+    def classify_arrays(visibility_miles: Sequence[float], ceiling_feet: Sequence[float]) -> List[str]:
+        """
+        Determine flight conditions for many observations at once.
+
+        Uses NumPy when available, otherwise classifies one by one.
 
-        # IFR: Ceiling 500-999' and/or visibility 1-3 miles
-        elif ceiling_feet < 1000 or visibility_miles < 3:
-            return "IFR"
+        Args:
+            visibility_miles: Visibility in statute miles for each observation
+            ceiling_feet: Ceiling in feet AGL for each observation (NaN or None if no ceiling)
+
+        Returns:
+            Flight condition for each observation, in input order
+        """
+        if np is None:
+            return [
+                FlightConditions.determine_flight_conditions(
+                    visibility, None if ceiling is None or math.isnan(ceiling) else ceiling
+                )
+                for visibility, ceiling in zip(visibility_miles, ceiling_feet)
+            ]
 
-        # MVFR: Ceiling 1000-3000' and/or visibility 3-5 miles
-        elif ceiling_feet < 3000 or visibility_miles < 5:
-            return "MVFR"
+        vis = np.asarray(visibility_miles, dtype=np.float64)
+        ceil = np.asarray(ceiling_feet, dtype=np.float64)  # None becomes NaN
+        ceil = np.where(np.isnan(ceil), 10000, ceil)
 
-        # VFR: Ceiling > 3000' and visibility > 5 miles
-        else:
-            return "VFR"
+        # digitize counts the thresholds at or below each value; 3 minus that is the bucket
+        ceiling_bucket = 3 - np.digitize(ceil, sorted(FlightConditions._CEILING_THRESHOLDS))
+        visibility_bucket = 3 - np.digitize(vis, sorted(FlightConditions._VISIBILITY_THRESHOLDS))
+        return np.array(FlightConditions._TABLE)[ceiling_bucket, visibility_bucket].tolist()
 
 class NewEnglandAirports:
     """New England airports database with ICAO codes and information"""
@@ -136,28 +309,126 @@ class NewEnglandAirports:
                 "city": "Bar Harbor", "state": "ME", "lat": 44.44975, "lon": -68.36158},
     }
 
+    # AIRPORTS split into parallel columns, in the same order, for bounding box queries
+    _ICAO = tuple(AIRPORTS)
+    _LAT = tuple(info['lat'] for info in AIRPORTS.values())
+    _LON = tuple(info['lon'] for info in AIRPORTS.values())
+    if np is not None:
+        _ICAO = np.array(_ICAO)
+        _LAT = np.array(_LAT, dtype=np.float64)
+        _LON = np.array(_LON, dtype=np.float64)
+
+    # Read-only view handed to callers, and the by-state grouping built on first use
+    _AIRPORTS_VIEW = MappingProxyType(AIRPORTS)
+    _by_state: Optional[Mapping[str, Tuple[Tuple[str, Dict], ...]]] = None
+
+    @classmethod
+    def get_airports(cls) -> Mapping[str, Dict]:
+        """Get all New England airports (read-only)"""
+        return cls._AIRPORTS_VIEW
+
     @classmethod
-    def get_airports(cls) -> Dict[str, Dict]:
-        """Get all New England airports"""
-        return cls.AIRPORTS
+    def get_airports_by_state(cls) -> Mapping[str, Tuple[Tuple[str, Dict], ...]]:
+        """Get (ICAO, info) pairs grouped by state, with states in alphabetical order"""
+        if cls._by_state is None:
+            by_state: Dict[str, List[Tuple[str, Dict]]] = {}
+            for icao, info in cls.AIRPORTS.items():
+                by_state.setdefault(info['state'], []).append((icao, info))
+            cls._by_state = MappingProxyType({
+                state: tuple(by_state[state]) for state in sorted(by_state)
+            })
+        return cls._by_state
 
     @classmethod
     def get_airport_info(cls, icao: str) -> Optional[Dict]:
         """Get specific airport information"""
         return cls.AIRPORTS.get(icao)
 
+    @classmethod
+    def get_within_bbox(cls, lat_min: float, lat_max: float,
+                        lon_min: float, lon_max: float) -> List[str]:
+        """
+        Get the ICAO codes of airports inside a latitude/longitude box
+
+        Args:
+            lat_min: Southern edge in degrees
+            lat_max: Northern edge in degrees
+            lon_min: Western edge in degrees
+            lon_max: Eastern edge in degrees
+
+        Returns:
+            ICAO codes of the airports inside the box, edges included
+        """
+        if np is not None:
+            mask = (
+                (cls._LAT >= lat_min) & (cls._LAT <= lat_max) &
+                (cls._LON >= lon_min) & (cls._LON <= lon_max)
+            )
+            return cls._ICAO[mask].tolist()
+
+        return [
+            icao for icao, lat, lon in zip(cls._ICAO, cls._LAT, cls._LON)
+            if lat_min <= lat <= lat_max and lon_min <= lon <= lon_max
+        ]
+
 class MetarApiClient:
     """Client for retrieving METAR and TAF data from Aviation Weather Center API"""
 
     BASE_URL = "https://aviationweather.gov/api/data"
+    HEADERS = {
+        'User-Agent': 'AndurilLatticeWeatherIntegration/1.0',
+        'Accept-Encoding': 'gzip'
+    }
+
+    # METAR response format: 'csv' is smaller and cheaper to parse, 'json' is the fallback
+    METAR_FORMAT = 'csv'
+
+    # Maximum number of parsed METAR reports kept in memory
+    PARSE_CACHE_SIZE = 1024
+
+    # Fetched reports are reused for this long, so overlapping requests in
+    # quick succession do not refetch the same stations; TAFs are issued
+    # every six hours and amended rarely, so they are kept longer
+    METAR_TTL_SECONDS = 300.0
+    TAF_TTL_SECONDS = 1800.0
+
+    # Longer airport lists are split into concurrent requests of this many IDs
+    MAX_IDS_PER_REQUEST = 50
+
+    # Connection pool shared by requests to the API host
+    LIMITS = httpx.Limits(max_keepalive_connections=4, max_connections=16, keepalive_expiry=300)
+
+    # Transient failures are retried with exponential backoff and full jitter
+    MAX_RETRIES = 4
+    BACKOFF_FACTOR = 0.5
+    MAX_BACKOFF_SECONDS = 30.0
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
 
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'AndurilLatticeWeatherIntegration/1.0'
-        })
+        self.session = httpx.Client(headers=self.HEADERS, timeout=30, limits=self.LIMITS)
+        # Created on first async request, inside the running event loop
+        self._async_session: Optional[httpx.AsyncClient] = None
+        # Raw METAR text -> parsed fields, oldest first
+        self._parse_cache: Dict[str, Dict] = {}
+        # ICAO code -> (monotonic fetch time, METAR or TAF data)
+        self._metar_cache: Dict[str, Tuple[float, Dict]] = {}
+        self._taf_cache: Dict[str, Tuple[float, Dict]] = {}
+
+    def _ensure_async_session(self) -> httpx.AsyncClient:
+        """Return the async HTTP client, creating it on first use"""
+        if self._async_session is None or self._async_session.is_closed:
+            self._async_session = httpx.AsyncClient(
+                headers=self.HEADERS, timeout=30, limits=self.LIMITS
+            )
+        return self._async_session
 
-    def get_metar_data(self, icao_codes: List[str]) -> Dict[str, Dict]:
+    async def aclose(self):
+        """Close the async HTTP client"""
+        if self._async_session is not None:
+            await self._async_session.aclose()
+            self._async_session = None
+
+    def get_metar_data(self, icao_codes: Sequence[str]) -> Dict[str, Dict]:
         """
         Retrieve METAR data for specified airports
 
@@ -167,46 +438,58 @@ class MetarApiClient:
         Returns:
             Dictionary mapping ICAO codes to METAR data
         """
-        try:
-            # Join ICAO codes for API request
-            stations_param = ",".join(icao_codes)
-
-            # API endpoint for METAR data
-            url = f"{self.BASE_URL}/metar"
-            params = {
-                'ids': stations_param,
-                'format': 'json',
-                'taf': 'false',
-                'hours': '2'  # Get last 2 hours of data
-            }
-
-            logger.info(f"Requesting METAR data for {len(icao_codes)} airports")
-            response = self.session.get(url, params=params, timeout=30)
-            response.raise_for_status()
+        metar_dict, missing = self._cached_reports(self._metar_cache, self.METAR_TTL_SECONDS, icao_codes)
+        fetched = {}
+        for chunk in self._chunk_codes(missing):
+            fetched.update(self._fetch_metar(chunk))
+        self._metar_cache = self._store_reports(self._metar_cache, self.METAR_TTL_SECONDS, fetched)
+        metar_dict.update(fetched)
+        return metar_dict
+
+    async def get_metar_data_async(self, icao_codes: Sequence[str]) -> Dict[str, Dict]:
+        """
+        Retrieve METAR data for specified airports without blocking the event loop
 
-            # Parse response
-            data = response.json()
+        Large airport lists are split into batches that are requested concurrently.
 
-            # Process METAR data
-            metar_dict = {}
-            for metar_data in data:
-                icao = metar_data.get('icaoId', '').upper()
-                if icao in icao_codes:
-                    metar_dict[icao] = self._process_metar_data(metar_data)
+        Args:
+            icao_codes: List of ICAO airport codes
 
-            logger.info(f"Successfully retrieved METAR data for {len(metar_dict)} airports")
-            return metar_dict
+        Returns:
+            Dictionary mapping ICAO codes to METAR data
+        """
+        metar_dict, missing = self._cached_reports(self._metar_cache, self.METAR_TTL_SECONDS, icao_codes)
+        results = await asyncio.gather(
+            *(self._fetch_metar_async(chunk) for chunk in self._chunk_codes(missing))
+        )
+        fetched = {icao: data for result in results for icao, data in result.items()}
+        self._metar_cache = self._store_reports(self._metar_cache, self.METAR_TTL_SECONDS, fetched)
+        metar_dict.update(fetched)
+        return metar_dict
+
+    def get_taf_data(self, icao_codes: Sequence[str]) -> Dict[str, Dict]:
+        """
+        Retrieve TAF (Terminal Aerodrome Forecast) data for specified airports
 
-        except requests.RequestException as e:
-            logger.error(f"Failed to retrieve METAR data: {e}")
-            return {}
-        except Exception as e:
-            logger.error(f"Error processing METAR data: {e}")
-            return {}
+        Args:
+            icao_codes: List of ICAO airport codes
 
-    def get_taf_data(self, icao_codes: List[str]) -> Dict[str, Dict]:
+        Returns:
+            Dictionary mapping ICAO codes to TAF data
         """
-        Retrieve TAF (Terminal Aerodrome Forecast) data for specified airports
+        taf_dict, missing = self._cached_reports(self._taf_cache, self.TAF_TTL_SECONDS, icao_codes)
+        fetched = {}
+        for chunk in self._chunk_codes(missing):
+            fetched.update(self._fetch_taf(chunk))
+        self._taf_cache = self._store_reports(self._taf_cache, self.TAF_TTL_SECONDS, fetched)
+        taf_dict.update(fetched)
+        return taf_dict
+
+    async def get_taf_data_async(self, icao_codes: Sequence[str]) -> Dict[str, Dict]:
+        """
+        Retrieve TAF data for specified airports without blocking the event loop
+
+        Large airport lists are split into batches that are requested concurrently.
 
         Args:
             icao_codes: List of ICAO airport codes
@@ -214,77 +497,204 @@ class MetarApiClient:
         Returns:
             Dictionary mapping ICAO codes to TAF data
         """
+        taf_dict, missing = self._cached_reports(self._taf_cache, self.TAF_TTL_SECONDS, icao_codes)
+        results = await asyncio.gather(
+            *(self._fetch_taf_async(chunk) for chunk in self._chunk_codes(missing))
+        )
+        fetched = {icao: data for result in results for icao, data in result.items()}
+        self._taf_cache = self._store_reports(self._taf_cache, self.TAF_TTL_SECONDS, fetched)
+        taf_dict.update(fetched)
+        return taf_dict
+
+    @staticmethod
+    def _cached_reports(cache: Dict[str, Tuple[float, Dict]], ttl: float,
+                        icao_codes: Sequence[str]) -> Tuple[Dict[str, Dict], List[str]]:
+        """Split ICAO codes into still-fresh cached reports and the codes to fetch"""
+        now = time.monotonic()
+        cached = {}
+        missing = []
+        for icao in icao_codes:
+            entry = cache.get(icao)
+            if entry is not None and now - entry[0] < ttl:
+                cached[icao] = entry[1]
+            else:
+                missing.append(icao)
+        return cached, missing
+
+    @staticmethod
+    def _store_reports(cache: Dict[str, Tuple[float, Dict]], ttl: float,
+                       reports: Dict[str, Dict]) -> Dict[str, Tuple[float, Dict]]:
+        """Return the cache without expired entries plus freshly fetched reports; errors are not cached"""
+        now = time.monotonic()
+        cache = {icao: entry for icao, entry in cache.items() if now - entry[0] < ttl}
+        for icao, data in reports.items():
+            if 'error' not in data:
+                cache[icao] = (now, data)
+        return cache
+
+    def _chunk_codes(self, icao_codes: Sequence[str]) -> List[Sequence[str]]:
+        """Split ICAO codes into batches of at most MAX_IDS_PER_REQUEST"""
+        size = self.MAX_IDS_PER_REQUEST
+        return [icao_codes[i:i + size] for i in range(0, len(icao_codes), size)]
+
+    def _fetch_metar(self, icao_codes: Sequence[str]) -> Dict[str, Dict]:
+        """Fetch METAR data for one batch of airports"""
         try:
-            stations_param = ",".join(icao_codes)
+            logger.info(f"Requesting METAR data for {len(icao_codes)} airports")
+            response = self._get("metar", self._metar_params(icao_codes))
+            return self._process_metar_response(self._decode_metar_response(response), icao_codes)
 
-            url = f"{self.BASE_URL}/taf"
-            params = {
-                'ids': stations_param,
-                'format': 'json'
-            }
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to retrieve METAR data: {e}")
+            return {}
+        except Exception as e:
+            logger.error(f"Error processing METAR data: {e}")
+            return {}
 
-            logger.info(f"Requesting TAF data for {len(icao_codes)} airports")
-            response = self.session.get(url, params=params, timeout=30)
-            response.raise_for_status()
+    async def _fetch_metar_async(self, icao_codes: Sequence[str]) -> Dict[str, Dict]:
+        """Fetch METAR data for one batch of airports without blocking"""
+        try:
+            logger.info(f"Requesting METAR data for {len(icao_codes)} airports")
+            response = await self._get_async("metar", self._metar_params(icao_codes))
+            return self._process_metar_response(self._decode_metar_response(response), icao_codes)
+
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to retrieve METAR data: {e}")
+            return {}
+        except Exception as e:
+            logger.error(f"Error processing METAR data: {e}")
+            return {}
 
-            data = response.json()
+    def _fetch_taf(self, icao_codes: Sequence[str]) -> Dict[str, Dict]:
+        """Fetch TAF data for one batch of airports"""
+        try:
+            logger.info(f"Requesting TAF data for {len(icao_codes)} airports")
+            response = self._get("taf", self._taf_params(icao_codes))
+            return self._process_taf_response(_json_loads(response.content), icao_codes)
 
-            taf_dict = {}
-            for taf_data in data:
-                icao = taf_data.get('icaoId', '').upper()
-                if icao in icao_codes:
-                    taf_dict[icao] = self._process_taf_data(taf_data)
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to retrieve TAF data: {e}")
+            return {}
+        except Exception as e:
+            logger.error(f"Error processing TAF data: {e}")
+            return {}
 
-            logger.info(f"Successfully retrieved TAF data for {len(taf_dict)} airports")
-            return taf_dict
+    async def _fetch_taf_async(self, icao_codes: Sequence[str]) -> Dict[str, Dict]:
+        """Fetch TAF data for one batch of airports without blocking"""
+        try:
+            logger.info(f"Requesting TAF data for {len(icao_codes)} airports")
+            response = await self._get_async("taf", self._taf_params(icao_codes))
+            return self._process_taf_response(_json_loads(response.content), icao_codes)
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Failed to retrieve TAF data: {e}")
             return {}
         except Exception as e:
             logger.error(f"Error processing TAF data: {e}")
             return {}
 
+    def _get(self, endpoint: str, params: Dict[str, str]) -> httpx.Response:
+        """GET an API endpoint, retrying transient failures"""
+        for attempt in range(self.MAX_RETRIES + 1):
+            try:
+                response = self.session.get(f"{self.BASE_URL}/{endpoint}", params=params)
+            except httpx.TransportError:
+                if attempt == self.MAX_RETRIES:
+                    raise
+                response = None
+
+            if response is not None and (response.status_code not in self.RETRY_STATUSES
+                                         or attempt == self.MAX_RETRIES):
+                response.raise_for_status()
+                return response
+
+            delay = self._retry_delay(attempt, response)
+            logger.warning(f"Retrying {endpoint} request in {delay:.1f}s (attempt {attempt + 1})")
+            time.sleep(delay)
+
+    async def _get_async(self, endpoint: str, params: Dict[str, str]) -> httpx.Response:
+        """GET an API endpoint without blocking the event loop, retrying transient failures"""
+        session = self._ensure_async_session()
+        for attempt in range(self.MAX_RETRIES + 1):
+            try:
+                response = await session.get(f"{self.BASE_URL}/{endpoint}", params=params)
+            except httpx.TransportError:
+                if attempt == self.MAX_RETRIES:
+                    raise
+                response = None
+
+            if response is not None and (response.status_code not in self.RETRY_STATUSES
+                                         or attempt == self.MAX_RETRIES):
+                response.raise_for_status()
+                return response
+
+            delay = self._retry_delay(attempt, response)
+            logger.warning(f"Retrying {endpoint} request in {delay:.1f}s (attempt {attempt + 1})")
+            await asyncio.sleep(delay)
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """Seconds to wait before the next attempt, honoring Retry-After when given"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return min(float(retry_after), self.MAX_BACKOFF_SECONDS)
+
+        return random.uniform(0, min(self.BACKOFF_FACTOR * 2 ** attempt, self.MAX_BACKOFF_SECONDS))
+
+    def _metar_params(self, icao_codes: Sequence[str]) -> Dict[str, str]:
+        """Query parameters for a METAR request"""
+        return {
+            'ids': _join_icao_codes(tuple(icao_codes)),
+            'format': self.METAR_FORMAT,
+            'taf': 'false',
+            'hours': '2'  # Get last 2 hours of data
+        }
+
+    def _taf_params(self, icao_codes: Sequence[str]) -> Dict[str, str]:
+        """Query parameters for a TAF request"""
+        return {
+            'ids': _join_icao_codes(tuple(icao_codes)),
+            'format': 'json'
+        }
+
+    def _decode_metar_response(self, response: httpx.Response) -> Iterable[Dict]:
+        """Decode a METAR response body into one dict per report"""
+        if self.METAR_FORMAT == 'csv':
+            return csv.DictReader(io.StringIO(response.text))
+        return _json_loads(response.content)
+
+    def _process_metar_response(self, data: Iterable[Dict], icao_codes: Sequence[str]) -> Dict[str, Dict]:
+        """Process the METAR entries in an API response"""
+        metar_dict = {}
+        for metar_data in data:
+            icao = metar_data.get('icaoId', '').upper()
+            if icao in icao_codes:
+                metar_dict[icao] = self._process_metar_data(metar_data)
+
+        logger.info(f"Successfully retrieved METAR data for {len(metar_dict)} airports")
+        return metar_dict
+
+    def _process_taf_response(self, data: List[Dict], icao_codes: Sequence[str]) -> Dict[str, Dict]:
+        """Process the TAF entries in an API response"""
+        taf_dict = {}
+        for taf_data in data:
+            icao = taf_data.get('icaoId', '').upper()
+            if icao in icao_codes:
+                taf_dict[icao] = self._process_taf_data(taf_data)
+
+        logger.info(f"Successfully retrieved TAF data for {len(taf_dict)} airports")
+        return taf_dict
+
     def _process_metar_data(self, metar_data: Dict) -> Dict:
         """Process raw METAR data from API"""
         try:
             raw_text = metar_data.get('rawOb', '')
 
-            # Parse METAR using python-metar library
             try:
-                metar_obj = Metar.Metar(raw_text)
-
-                # Extract key weather information
-                visibility_miles = None
-                if metar_obj.vis:
-                    visibility_miles = metar_obj.vis.value('SM')
-
-                ceiling_feet = None
-                if metar_obj.sky:
-                    for layer in metar_obj.sky:
-                        if layer[0] in ['BKN', 'OVC']:  # Broken or Overcast
-                            if layer[1]:
-                                ceiling_feet = layer[1].value('FT')
-                                break
-
-                # Determine flight conditions
-                flight_condition = FlightConditions.determine_flight_conditions(
-                    visibility_miles or 10.0, ceiling_feet
-                )
-
                 return {
                     'raw_text': raw_text,
                     'parsed_time': metar_data.get('obsTime'),
-                    'temperature_c': metar_obj.temp.value('C') if metar_obj.temp else None,
-                    'dewpoint_c': metar_obj.dewpt.value('C') if metar_obj.dewpt else None,
-                    'wind_direction': metar_obj.wind_dir.value() if metar_obj.wind_dir else None,
-                    'wind_speed_kt': metar_obj.wind_speed.value('KT') if metar_obj.wind_speed else None,
-                    'visibility_miles': visibility_miles,
-                    'ceiling_feet': ceiling_feet,
-                    'pressure_mb': metar_obj.press.value('MB') if metar_obj.press else None,
-                    'flight_condition': flight_condition,
-                    'weather_conditions': str(metar_obj.weather) if metar_obj.weather else None,
-                    'sky_conditions': self._format_sky_conditions(metar_obj.sky),
+                    **self._parse_report(raw_text)
                 }
 
             except Exception as parse_error:
@@ -300,6 +710,61 @@ class MetarApiClient:
             logger.error(f"Error processing METAR data: {e}")
             return {'error': str(e)}
 
+    def _parse_report(self, raw_text: str) -> Dict:
+        """
+        Parse a raw METAR report into weather fields and its flight condition
+
+        Reports are cached by their text, which includes the station and the
+        observation time, so a report seen in an earlier poll is not parsed again.
+
+        Args:
+            raw_text: Raw METAR report text
+
+        Returns:
+            Parsed weather fields (callers must not modify the returned dict)
+        """
+        weather = self._parse_cache.get(raw_text)
+        if weather is not None:
+            return weather
+
+        # Routine reports are read with precompiled regexes; anything
+        # else goes through the python-metar library
+        fields = _fast_parse_metar(raw_text)
+        if fields is None:
+            fields = self._parse_with_metar_library(raw_text)
+
+        # Ceiling is the first broken or overcast layer
+        ceiling_feet = None
+        for coverage, altitude_ft in fields['sky_layers']:
+            if coverage in ('BKN', 'OVC') and altitude_ft is not None:
+                ceiling_feet = altitude_ft
+                break
+
+        # Determine flight conditions
+        flight_condition = FlightConditions.determine_flight_conditions(
+            fields['visibility_miles'] or 10.0, ceiling_feet
+        )
+
+        weather = {
+            'temperature_c': fields['temperature_c'],
+            'dewpoint_c': fields['dewpoint_c'],
+            'wind_direction': fields['wind_direction'],
+            'wind_speed_kt': fields['wind_speed_kt'],
+            'visibility_miles': fields['visibility_miles'],
+            'ceiling_feet': ceiling_feet,
+            'pressure_mb': fields['pressure_mb'],
+            'flight_condition': flight_condition,
+            'weather_conditions': fields.get('weather_conditions'),
+            'sky_conditions': self._format_sky_conditions(fields['sky_layers']),
+        }
+
+        if len(self._parse_cache) >= self.PARSE_CACHE_SIZE:
+            # Evict the oldest entry; dicts preserve insertion order
+            del self._parse_cache[next(iter(self._parse_cache))]
+        self._parse_cache[raw_text] = weather
+
+        return weather
+
     def _process_taf_data(self, taf_data: Dict) -> Dict:
         """Process raw TAF data from API"""
         try:
@@ -313,22 +778,74 @@ class MetarApiClient:
             logger.error(f"Error processing TAF data: {e}")
             return {'error': str(e)}
 
-    def _format_sky_conditions(self, sky_layers) -> str:
-        """Format sky condition layers into readable string"""
+    def _parse_with_metar_library(self, raw_text: str) -> Dict:
+        """Parse a METAR with python-metar into the fields _fast_parse_metar returns"""
+        metar_obj = Metar.Metar(raw_text)
+        return {
+            'temperature_c': metar_obj.temp.value('C') if metar_obj.temp else None,
+            'dewpoint_c': metar_obj.dewpt.value('C') if metar_obj.dewpt else None,
+            'wind_direction': metar_obj.wind_dir.value() if metar_obj.wind_dir else None,
+            'wind_speed_kt': metar_obj.wind_speed.value('KT') if metar_obj.wind_speed else None,
+            'visibility_miles': metar_obj.vis.value('SM') if metar_obj.vis else None,
+            'pressure_mb': metar_obj.press.value('MB') if metar_obj.press else None,
+            'sky_layers': [
+                (layer[0], layer[1].value('FT') if layer[1] else None)
+                for layer in metar_obj.sky
+            ],
+            'weather_conditions': str(metar_obj.weather) if metar_obj.weather else None,
+        }
+
+    def _format_sky_conditions(self, sky_layers: List[Tuple[str, Optional[float]]]) -> str:
+        """Format (coverage, altitude_ft) sky layers into readable string"""
         if not sky_layers:
             return "Clear"
 
         conditions = []
-        for layer in sky_layers:
-            coverage = layer[0]
-            altitude = layer[1].value('FT') if layer[1] else 'unknown'
+        for coverage, altitude_ft in sky_layers:
+            altitude = altitude_ft if altitude_ft is not None else 'unknown'
             conditions.append(f"{coverage} {altitude}ft")
 
         return ", ".join(conditions)
 
+@dataclass(frozen=True)
+class _AirportLabels:
+    """Per-airport text for weather entities, formatted once at startup"""
+
+    __slots__ = ('name_prefix', 'description_format')
+
+    name_prefix: str         # "<name> (<ICAO>) - "
+    description_format: str  # str.format template for the weather description
+
+    @classmethod
+    def for_airport(cls, icao: str, airport_info: Dict) -> '_AirportLabels':
+        prefix = (
+            f"Airport: {airport_info['name']} | "
+            f"Location: {airport_info['city']}, {airport_info['state']} | "
+        )
+        return cls(
+            name_prefix=f"{airport_info['name']} ({icao}) - ",
+            # Optional parts are rendered as " | <part>" or "" by the caller
+            description_format=(
+                prefix.replace("{", "{{").replace("}", "}}")
+                + "Flight Conditions: {flight_condition}{temperature}{wind}{visibility}"
+            ),
+        )
+
 class LatticeWeatherIntegration:
     """Main integration class for publishing weather entities to Lattice"""
 
+    MAX_CONCURRENT_PUBLISHES = 8
+
+    # How long a published weather entity stays valid
+    ENTITY_TTL = timedelta(hours=2)
+
+    # Unchanged reports are republished after this long so the entity never lapses
+    ENTITY_REFRESH = timedelta(hours=1)
+
+    # Routine METARs are issued shortly before the hour; cycles are aligned so
+    # one runs at this minute past every hour the update interval allows
+    CYCLE_MINUTE = 55
+
     def __init__(self):
         # Get configuration from environment variables
         self.lattice_url = os.getenv('LATTICE_URL')
@@ -349,12 +866,62 @@ class LatticeWeatherIntegration:
         if self.sandboxes_token:
             self.metadata['anduril-sandbox-authorization'] = f"Bearer {self.sandboxes_token}"
 
+        # grpclib takes metadata as (key, value) pairs as well as a dict;
+        # build the pairs once instead of from the dict on every call
+        self._metadata_items = tuple(self.metadata.items())
+
         # Initialize clients
         self.metar_client = MetarApiClient()
         self.airports = NewEnglandAirports.get_airports()
+        self._icao_codes: Tuple[str, ...] = tuple(self.airports)
+
+        # ICAO -> (hash of the last published METAR text, when it was published)
+        self._last_hash: Dict[str, Tuple[str, datetime]] = {}
+
+        # Entity fields that are the same every cycle, built once
+        self._static_mil_view = MilView(
+            disposition=Disposition.ASSUMED_FRIENDLY,
+            environment=Environment.SURFACE
+        )
+        self._static_ontology = Ontology(
+            template=Template.SENSOR_POINT_OF_INTEREST,
+            platform_type="WEATHER_STATION"
+        )
+        self._entity_templates = {
+            icao: self._build_entity_template(icao, info)
+            for icao, info in self.airports.items()
+        }
+        self._airport_labels = {
+            icao: _AirportLabels.for_airport(icao, info)
+            for icao, info in self.airports.items()
+        }
+
+        # Set by stop() to end run_integration between cycles; created by
+        # run_integration so it belongs to the loop that waits on it
+        self._stop_event: Optional[asyncio.Event] = None
+
+        # gRPC channel shared by all publishes, opened on first use
+        self._channel: Optional[Channel] = None
+        self._stub: Optional[EntityManagerApiStub] = None
 
         logger.info(f"Initialized Lattice integration for {len(self.airports)} airports")
 
+    def _ensure_channel(self) -> EntityManagerApiStub:
+        """Return the shared Entity Manager stub, opening the channel on first use"""
+        # Created lazily because grpclib binds the channel to the running event loop
+        if self._stub is None:
+            self._channel = Channel(host=self.lattice_url, port=443, ssl=True)
+            self._stub = EntityManagerApiStub(self._channel)
+        return self._stub
+
+    async def close(self):
+        """Close the gRPC channel and the METAR client"""
+        if self._channel is not None:
+            self._channel.close()
+            self._channel = None
+            self._stub = None
+        await self.metar_client.aclose()
+
     async def publish_weather_entity(self, icao: str, airport_info: Dict, 
                                    metar_data: Dict, taf_data: Optional[Dict] = None) -> bool:
         """
@@ -370,146 +937,284 @@ class LatticeWeatherIntegration:
             True if successful, False otherwise
         """
         try:
-            channel = Channel(host=self.lattice_url, port=443, ssl=True)
-            stub = EntityManagerApiStub(channel)
+            current_time = datetime.now(timezone.utc)
+            entity = self._build_weather_entity(
+                icao, airport_info, metar_data, taf_data,
+                current_time, current_time + self.ENTITY_TTL
+            )
+        except Exception as e:
+            logger.error(f"Failed to publish weather entity for {icao}: {e}")
+            return False
 
-            # Create unique entity ID for this airport
-            entity_id = f"weather-{icao.lower()}-{uuid4()}"
+        return await self._publish_entity(icao, entity)
 
-            # Get current time
-            current_time = datetime.now(timezone.utc)
+    async def publish_weather_entities(self, metar_data: Dict[str, Dict],
+                                       taf_data: Dict[str, Dict],
+                                       cycle_time: Optional[datetime] = None) -> int:
+        """
+        Publish weather entities for every airport with valid METAR data
 
-            # Create entity name
-            flight_condition = metar_data.get('flight_condition', 'UNKNOWN')
-            entity_name = f"{airport_info['name']} ({icao}) - {flight_condition}"
+        All entities are sent over one PublishEntities client stream. If the
+        stream fails, each entity is published with its own unary call.
+        Airports whose METAR text has not changed since their last publish are
+        skipped until ENTITY_REFRESH has passed.
 
-            # Create description with weather summary
-            description_parts = [
-                f"Airport: {airport_info['name']}",
-                f"Location: {airport_info['city']}, {airport_info['state']}",
-                f"Flight Conditions: {flight_condition}",
-            ]
+        Args:
+            metar_data: Dictionary mapping ICAO codes to METAR data
+            taf_data: Dictionary mapping ICAO codes to TAF data
+            cycle_time: Creation time shared by every entity (defaults to now)
 
-            if 'temperature_c' in metar_data and metar_data['temperature_c'] is not None:
-                temp_f = (metar_data['temperature_c'] * 9/5) + 32
-                description_parts.append(f"Temperature: {temp_f:.1f}°F ({metar_data['temperature_c']:.1f}°C)")
-
-            if 'wind_speed_kt' in metar_data and metar_data['wind_speed_kt'] is not None:
-                wind_dir = metar_data.get('wind_direction', 'VRB')
-                description_parts.append(f"Wind: {wind_dir}° at {metar_data['wind_speed_kt']} knots")
-
-            if 'visibility_miles' in metar_data and metar_data['visibility_miles'] is not None:
-                description_parts.append(f"Visibility: {metar_data['visibility_miles']} miles")
-
-            description = " | ".join(description_parts)
-
-            # Create Lattice entity
-            entity = Entity(
-                entity_id=entity_id,
-                created_time=current_time,
-                expiry_time=current_time + timedelta(hours=2),  # Expire in 2 hours
-                aliases=Aliases(name=entity_name),
-                description=description,
-
-                # Set military view (neutral/informational)
-                mil_view=MilView(
-                    disposition=Disposition.ASSUMED_FRIENDLY,
-                    environment=Environment.SURFACE
-                ),
-
-                # Set location
-                location=Location(
-                    position=Position(
-                        latitude_degrees=airport_info['lat'],
-                        longitude_degrees=airport_info['lon'],
-                        altitude_hae_meters=0.0  # Airport elevation (simplified)
-                    )
-                ),
-
-                # Set ontology - use sensor point of interest for weather stations
-                ontology=Ontology(
-                    template=Template.SENSOR_POINT_OF_INTEREST,
-                    platform_type="WEATHER_STATION"
-                ),
-
-                # Set provenance
-                provenance=Provenance(
-                    integration_name="metar_weather_integration",
-                    data_type="aviation_weather",
-                    source_update_time=current_time
-                ),
-
-                is_live=True
-            )
+        Returns:
+            Number of entities successfully published
+        """
+        # All entities in a cycle share the same timestamps
+        if cycle_time is None:
+            cycle_time = datetime.now(timezone.utc)
+        expiry_time = cycle_time + self.ENTITY_TTL
+
+        entities = {}
+        hashes = {}
+        unchanged = 0
+        for icao, airport_info in self.airports.items():
+            metar_info = metar_data.get(icao)
+
+            if not metar_info or metar_info.get('error'):
+                logger.warning(f"No valid METAR data for {icao}")
+                continue
+
+            report_hash = hashlib.blake2b(
+                metar_info.get('raw_text', '').encode(), digest_size=16
+            ).hexdigest()
+            last = self._last_hash.get(icao)
+            if last and last[0] == report_hash and cycle_time - last[1] < self.ENTITY_REFRESH:
+                logger.debug(f"METAR for {icao} unchanged, skipping publish")
+                unchanged += 1
+                continue
+            hashes[icao] = report_hash
 
-            # Publish entity
-            request = PublishEntityRequest(entity=entity)
-            response = await stub.publish_entity(request, metadata=self.metadata)
+            try:
+                entities[icao] = self._build_weather_entity(
+                    icao, airport_info, metar_info, taf_data.get(icao),
+                    cycle_time, expiry_time
+                )
+            except Exception as e:
+                logger.error(f"Failed to build weather entity for {icao}: {e}")
 
-            channel.close()
+        if unchanged:
+            logger.info(f"Skipped {unchanged} weather entities with unchanged METAR reports")
+        if not entities:
+            return 0
+
+        try:
+            stub = self._ensure_channel()
+            await stub.publish_entities(
+                (PublishEntitiesRequest(entity=entity) for entity in entities.values()),
+                metadata=self._metadata_items
+            )
+            logger.info(f"Published {len(entities)} weather entities over one stream")
+            for icao in entities:
+                self._last_hash[icao] = (hashes[icao], cycle_time)
+            return len(entities)
+        except Exception as e:
+            logger.warning(f"Streaming publish failed, publishing individually: {e}")
+
+        # Limits how many entity publishes are in flight at once
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_PUBLISHES)
+
+        async def _publish(icao: str, entity: Entity) -> bool:
+            async with semaphore:
+                return await self._publish_entity(icao, entity)
+
+        # Re-sending the already built entities keeps their entity IDs
+        results = await asyncio.gather(
+            *(_publish(icao, entity) for icao, entity in entities.items()),
+            return_exceptions=True
+        )
+        for icao, result in zip(entities, results):
+            if result is True:
+                self._last_hash[icao] = (hashes[icao], cycle_time)
+        return sum(1 for result in results if result is True)
+
+    async def _publish_entity(self, icao: str, entity: Entity) -> bool:
+        """Publish one built entity with a unary call"""
+        try:
+            stub = self._ensure_channel()
+            request = PublishEntityRequest(entity=entity)
+            await stub.publish_entity(request, metadata=self._metadata_items)
 
-            logger.info(f"Successfully published weather entity for {icao}: {entity_name}")
+            logger.info(f"Successfully published weather entity for {icao}: {entity.aliases.name}")
             return True
 
         except Exception as e:
             logger.error(f"Failed to publish weather entity for {icao}: {e}")
             return False
 
+    def _build_weather_entity(self, icao: str, airport_info: Dict,
+                              metar_data: Dict, taf_data: Optional[Dict],
+                              current_time: datetime, expiry_time: datetime) -> Entity:
+        """Build the Lattice entity for one airport's weather"""
+        labels = self._airport_labels.get(icao) or _AirportLabels.for_airport(icao, airport_info)
+
+        # Create entity name
+        flight_condition = metar_data.get('flight_condition', 'UNKNOWN')
+        entity_name = labels.name_prefix + flight_condition
+
+        # Create description with weather summary
+        temperature = wind = visibility = ''
+
+        temp_c = metar_data.get('temperature_c')
+        if temp_c is not None:
+            temp_f = (temp_c * 9/5) + 32
+            temperature = f" | Temperature: {temp_f:.1f}°F ({temp_c:.1f}°C)"
+
+        wind_speed = metar_data.get('wind_speed_kt')
+        if wind_speed is not None:
+            wind_dir = metar_data.get('wind_direction', 'VRB')
+            wind = f" | Wind: {wind_dir}° at {wind_speed} knots"
+
+        visibility_miles = metar_data.get('visibility_miles')
+        if visibility_miles is not None:
+            visibility = f" | Visibility: {visibility_miles} miles"
+
+        description = labels.description_format.format(
+            flight_condition=flight_condition, temperature=temperature,
+            wind=wind, visibility=visibility
+        )
+
+        # Start from the airport's static template and fill in the weather
+        template = self._entity_templates.get(icao) or self._build_entity_template(icao, airport_info)
+        entity = copy.copy(template)
+        entity.created_time = current_time
+        entity.expiry_time = expiry_time
+        entity.aliases = Aliases(name=entity_name)
+        entity.description = description
+
+        # Set provenance
+        entity.provenance = Provenance(
+            integration_name="metar_weather_integration",
+            data_type="aviation_weather",
+            source_update_time=current_time
+        )
+
+        return entity
+
+    def _build_entity_template(self, icao: str, airport_info: Dict) -> Entity:
+        """Build the weather-independent part of an airport's entity"""
+        return Entity(
+            # Deterministic per airport, so every cycle updates the same entity
+            entity_id=f"weather-{icao.lower()}",
+
+            # Set military view (neutral/informational)
+            mil_view=self._static_mil_view,
+
+            # Set location
+            location=Location(
+                position=Position(
+                    latitude_degrees=airport_info['lat'],
+                    longitude_degrees=airport_info['lon'],
+                    altitude_hae_meters=0.0  # Airport elevation (simplified)
+                )
+            ),
+
+            # Set ontology - use sensor point of interest for weather stations
+            ontology=self._static_ontology,
+
+            is_live=True
+        )
+
+    def stop(self):
+        """Ask run_integration to exit; an in-progress cycle is allowed to finish"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    async def run_cycle(self) -> int:
+        """
+        Fetch weather for every airport and publish it to Lattice once
+
+        Returns:
+            Number of entities successfully published
+        """
+        icao_codes = self._icao_codes
+
+        # Retrieve METAR and TAF data concurrently
+        logger.info("Retrieving METAR and TAF data...")
+        metar_data, taf_data = await asyncio.gather(
+            self.metar_client.get_metar_data_async(icao_codes),
+            self.metar_client.get_taf_data_async(icao_codes)
+        )
+
+        # Publish entities for each airport with weather data
+        total_airports = len(icao_codes)
+        successful_publishes = await self.publish_weather_entities(
+            metar_data, taf_data, datetime.now(timezone.utc)
+        )
+
+        logger.info(
+            f"Published {successful_publishes}/{total_airports} weather entities to Lattice"
+        )
+        return successful_publishes
+
+    def _seconds_until_next_cycle(self, update_interval_minutes: int) -> float:
+        """Seconds until the next wall-clock time aligned to CYCLE_MINUTE and the interval"""
+        interval = update_interval_minutes * 60
+        offset = self.CYCLE_MINUTE * 60
+        return (offset - time.time()) % interval or interval
+
+    async def _wait(self, seconds: float) -> bool:
+        """Sleep for up to seconds; return True if stop() was called meanwhile"""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
     async def run_integration(self, update_interval_minutes: int = 30):
         """
         Run the weather integration continuously
 
+        The first cycle runs immediately. Later cycles are aligned to the wall
+        clock so that one runs at CYCLE_MINUTE past the hour, when new routine
+        METARs are available. SIGINT and SIGTERM stop the loop between cycles.
+
         Args:
             update_interval_minutes: How often to update weather data
         """
         logger.info(f"Starting METAR to Lattice integration with {update_interval_minutes}-minute updates")
 
-        while True:
+        self._stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
             try:
-                # Get all ICAO codes
-                icao_codes = list(self.airports.keys())
-
-                # Retrieve METAR data
-                logger.info("Retrieving METAR data...")
-                metar_data = self.metar_client.get_metar_data(icao_codes)
-
-                # Retrieve TAF data
-                logger.info("Retrieving TAF data...")
-                taf_data = self.metar_client.get_taf_data(icao_codes)
-
-                # Publish entities for each airport with weather data
-                successful_publishes = 0
-                total_airports = len(icao_codes)
-
-                for icao in icao_codes:
-                    airport_info = self.airports[icao]
-                    metar_info = metar_data.get(icao)
-                    taf_info = taf_data.get(icao)
-
-                    if metar_info and not metar_info.get('error'):
-                        success = await self.publish_weather_entity(
-                            icao, airport_info, metar_info, taf_info
-                        )
-                        if success:
-                            successful_publishes += 1
-                    else:
-                        logger.warning(f"No valid METAR data for {icao}")
-
-                logger.info(
-                    f"Published {successful_publishes}/{total_airports} weather entities to Lattice"
-                )
-
-                # Wait for next update cycle
-                logger.info(f"Waiting {update_interval_minutes} minutes until next update...")
-                await asyncio.sleep(update_interval_minutes * 60)
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                # Not supported on this platform; KeyboardInterrupt still applies
+                pass
 
-            except KeyboardInterrupt:
-                logger.info("Integration stopped by user")
-                break
-            except Exception as e:
-                logger.error(f"Error in integration loop: {e}")
-                logger.info("Retrying in 5 minutes...")
-                await asyncio.sleep(300)  # Wait 5 minutes before retrying
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    await self.run_cycle()
+
+                    # Wait for next update cycle
+                    delay = self._seconds_until_next_cycle(update_interval_minutes)
+                    logger.info(f"Waiting {delay / 60:.1f} minutes until next update...")
+
+                except Exception as e:
+                    logger.error(f"Error in integration loop: {e}")
+                    logger.info("Retrying in 5 minutes...")
+                    delay = 300  # Wait 5 minutes before retrying
+
+                if await self._wait(delay):
+                    break
+
+            logger.info("Integration stopped")
+        finally:
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.remove_signal_handler(sig)
+                except (NotImplementedError, RuntimeError):
+                    pass
+            await self.close()
 
 def main():
     """Main entry point"""
@@ -7,6 +7,7 @@ Shows how to use the integration with different configurations
 import asyncio
 import os
 from datetime import datetime
+from operator import itemgetter
 from metar_lattice_integration import (
     LatticeWeatherIntegration, 
     MetarApiClient, 
@@ -14,127 +15,156 @@ from metar_lattice_integration import (
     FlightConditions
 )
 
-async def sample_basic_usage():
+async def sample_basic_usage(client):
     """Basic usage example - single weather data retrieval"""
-    print("=== Basic Usage Example ===")
-
-    # Initialize METAR client
-    client = MetarApiClient()
-
     # Get weather for Boston Logan
     airports = ['KBOS']
-    print(f"Getting weather for {airports}")
-
-    metar_data = client.get_metar_data(airports)
+    metar_data = await client.get_metar_data_async(airports)
 
+    # Header and results go out as one block, so examples running
+    # concurrently do not interleave
+    lines = ["=== Basic Usage Example ===", f"Getting weather for {airports}"]
     for icao, data in metar_data.items():
         if 'error' not in data:
-            print(f"\nAirport: {icao}")
-            print(f"Flight Condition: {data.get('flight_condition', 'Unknown')}")
-            print(f"Temperature: {data.get('temperature_c', 'N/A')}°C")
-            print(f"Visibility: {data.get('visibility_miles', 'N/A')} miles")
-            print(f"Wind: {data.get('wind_direction', 'N/A')}° at {data.get('wind_speed_kt', 'N/A')} knots")
-            print(f"Raw METAR: {data.get('raw_text', 'N/A')}")
-
-async def sample_multiple_airports():
+            lines += [
+                f"\nAirport: {icao}",
+                f"Flight Condition: {data.get('flight_condition', 'Unknown')}",
+                f"Temperature: {data.get('temperature_c', 'N/A')}°C",
+                f"Visibility: {data.get('visibility_miles', 'N/A')} miles",
+                f"Wind: {data.get('wind_direction', 'N/A')}° at {data.get('wind_speed_kt', 'N/A')} knots",
+                f"Raw METAR: {data.get('raw_text', 'N/A')}",
+            ]
+    print("\n".join(lines))
+
+# Column layout of the multiple-airports weather summary
+SUMMARY_ROW = "{:<6} {:<8} {:<8} {:<12} {:<15}"
+
+# Summary fields in column order, with what to show when a report lacks one;
+# summary_fields reads them all from a report in one call
+SUMMARY_DEFAULTS = {
+    'flight_condition': 'Unknown',
+    'temperature_c': 'N/A',
+    'visibility_miles': 'N/A',
+    'wind_direction': 'N/A',
+    'wind_speed_kt': 'N/A',
+}
+summary_fields = itemgetter(*SUMMARY_DEFAULTS)
+
+async def sample_multiple_airports(client):
     """Example with multiple airports"""
-    print("\n=== Multiple Airports Example ===")
-
-    client = MetarApiClient()
-
     # Get weather for major New England airports
     major_airports = ['KBOS', 'KMHT', 'KBDL', 'KPVD', 'KBTV', 'KBGR']
-    print(f"Getting weather for {len(major_airports)} major airports")
-
-    metar_data = client.get_metar_data(major_airports)
-
-    print(f"\nWeather Summary:")
-    print("-" * 80)
-    print(f"{'ICAO':<6} {'Condition':<8} {'Temp(°C)':<8} {'Visibility':<12} {'Wind':<15}")
-    print("-" * 80)
+    metar_data = await client.get_metar_data_async(major_airports)
+
+    # Build the header and whole table and print them in one call
+    lines = [
+        "\n=== Multiple Airports Example ===",
+        f"Getting weather for {len(major_airports)} major airports",
+        "\nWeather Summary:",
+        "-" * 80,
+        SUMMARY_ROW.format('ICAO', 'Condition', 'Temp(°C)', 'Visibility', 'Wind'),
+        "-" * 80,
+    ]
 
     for icao in major_airports:
         data = metar_data.get(icao, {})
-        if 'error' not in data:
-            condition = data.get('flight_condition', 'Unknown')
-            temp = f"{data.get('temperature_c', 'N/A')}"
-            vis = f"{data.get('visibility_miles', 'N/A')} mi"
-            wind_dir = data.get('wind_direction', 'N/A')
-            wind_speed = data.get('wind_speed_kt', 'N/A')
-            wind = f"{wind_dir}°@{wind_speed}kt"
+        if 'error' in data:
+            lines.append(SUMMARY_ROW.format(icao, 'ERROR', 'N/A', 'N/A', 'N/A'))
+            continue
+
+        condition, temp, vis, wind_dir, wind_speed = summary_fields({**SUMMARY_DEFAULTS, **data})
+        lines.append(SUMMARY_ROW.format(icao, condition, f"{temp}", f"{vis} mi", f"{wind_dir}°@{wind_speed}kt"))
+
+    print("\n".join(lines))
+
+# (visibility miles, ceiling ft, description) for the classification examples
+FLIGHT_SCENARIOS = (
+    (10.0, 5000, "Clear day"),
+    (4.0, 2500, "Hazy conditions"),
+    (2.0, 800, "Overcast low clouds"),
+    (0.5, 200, "Fog/low visibility"),
+    (6.0, 1500, "Broken clouds"),
+)
 
-            print(f"{icao:<6} {condition:<8} {temp:<8} {vis:<12} {wind:<15}")
-        else:
-            print(f"{icao:<6} {'ERROR':<8} {'N/A':<8} {'N/A':<12} {'N/A':<15}")
+# Row layout of the classification examples table
+SCENARIO_ROW = "{} miles     {} ft     {:<10} {}"
 
 def sample_flight_conditions():
     """Example of flight condition classification"""
     print("\n=== Flight Condition Classification Examples ===")
 
-    test_scenarios = [
-        {"visibility": 10.0, "ceiling": 5000, "description": "Clear day"},
-        {"visibility": 4.0, "ceiling": 2500, "description": "Hazy conditions"},
-        {"visibility": 2.0, "ceiling": 800, "description": "Overcast low clouds"},
-        {"visibility": 0.5, "ceiling": 200, "description": "Fog/low visibility"},
-        {"visibility": 6.0, "ceiling": 1500, "description": "Broken clouds"},
-    ]
-
-    print(f"{'Visibility':<12} {'Ceiling':<10} {'Condition':<10} {'Description'}")
-    print("-" * 60)
-
-    for scenario in test_scenarios:
-        vis = scenario["visibility"]
-        ceil = scenario["ceiling"]
-        desc = scenario["description"]
-        condition = FlightConditions.determine_flight_conditions(vis, ceil)
+    # Classify every scenario in one batch call
+    visibilities, ceilings, descriptions = zip(*FLIGHT_SCENARIOS)
+    conditions = FlightConditions.classify_arrays(visibilities, ceilings)
+    results = zip(visibilities, ceilings, conditions, descriptions)
 
-        print(f"{vis} miles{'':<4} {ceil} ft{'':<4} {condition:<10} {desc}")
+    lines = [f"{'Visibility':<12} {'Ceiling':<10} {'Condition':<10} {'Description'}", "-" * 60]
+    lines.extend(SCENARIO_ROW.format(*result) for result in results)
+    print("\n".join(lines))
 
 async def sample_lattice_integration():
     """Example of full Lattice integration (requires credentials)"""
-    print("\n=== Lattice Integration Example ===")
-
-    # Check if credentials are available
-    if not os.getenv('LATTICE_URL') or not os.getenv('ENVIRONMENT_TOKEN'):
-        print("Skipping Lattice integration - credentials not configured")
-        print("To run this example, set:")
-        print("  export LATTICE_URL='your-lattice-instance.com'")
-        print("  export ENVIRONMENT_TOKEN='your-bearer-token'")
-        return
-
+    # Everything the example reports is printed as one block at the end
+    lines = ["\n=== Lattice Integration Example ==="]
     try:
-        # Initialize integration
-        integration = LatticeWeatherIntegration()
-
-        # Get a few airports for demo
-        test_airports = ['KBOS', 'KMHT']
-
-        # Get weather data
-        client = MetarApiClient()
-        metar_data = client.get_metar_data(test_airports)
-        taf_data = client.get_taf_data(test_airports)
+        # Check if credentials are available
+        if not os.getenv('LATTICE_URL') or not os.getenv('ENVIRONMENT_TOKEN'):
+            lines += [
+                "Skipping Lattice integration - credentials not configured",
+                "To run this example, set:",
+                "  export LATTICE_URL='your-lattice-instance.com'",
+                "  export ENVIRONMENT_TOKEN='your-bearer-token'",
+            ]
+            return
 
-        # Publish to Lattice
-        airports_db = NewEnglandAirports.get_airports()
-
-        for icao in test_airports:
-            if icao in metar_data and 'error' not in metar_data[icao]:
-                airport_info = airports_db[icao]
-                metar_info = metar_data[icao]
-                taf_info = taf_data.get(icao)
-
-                print(f"Publishing weather entity for {icao}...")
-                success = await integration.publish_weather_entity(
-                    icao, airport_info, metar_info, taf_info
-                )
-
-                if success:
-                    print(f"✓ Successfully published {icao}")
+        # Initialize integration
+        try:
+            integration = LatticeWeatherIntegration()
+        except Exception as e:
+            lines.append(f"Error in Lattice integration: {e}")
+            return
+
+        try:
+            # Get a few airports for demo
+            test_airports = ['KBOS', 'KMHT']
+
+            # Fetch METARs and TAFs concurrently with the integration's own
+            # client, which close() shuts down
+            client = integration.metar_client
+            metar_data, taf_data = await asyncio.gather(
+                client.get_metar_data_async(test_airports),
+                client.get_taf_data_async(test_airports)
+            )
+
+            # Publish to Lattice
+            airports_db = NewEnglandAirports.get_airports()
+
+            # Publish all airports concurrently over the integration's shared channel
+            publish_icaos = [
+                icao for icao in test_airports
+                if icao in metar_data and 'error' not in metar_data[icao]
+            ]
+            lines.extend(f"Publishing weather entity for {icao}..." for icao in publish_icaos)
+
+            results = await asyncio.gather(
+                *(integration.publish_weather_entity(
+                    icao, airports_db[icao], metar_data[icao], taf_data.get(icao)
+                ) for icao in publish_icaos),
+                return_exceptions=True
+            )
+
+            for icao, success in zip(publish_icaos, results):
+                if success is True:
+                    lines.append(f"✓ Successfully published {icao}")
                 else:
-                    print(f"✗ Failed to publish {icao}")
+                    lines.append(f"✗ Failed to publish {icao}")
 
-    except Exception as e:
-        print(f"Error in Lattice integration: {e}")
+        except Exception as e:
+            lines.append(f"Error in Lattice integration: {e}")
+        finally:
+            await integration.close()
+    finally:
+        print("\n".join(lines))
 
 def sample_airport_database():
     """Example of using the airport database"""
@@ -144,19 +174,12 @@ def sample_airport_database():
 
     print(f"Total airports in database: {len(airports)}")
 
-    # Group by state
-    by_state = {}
-    for icao, info in airports.items():
-        state = info['state']
-        if state not in by_state:
-            by_state[state] = []
-        by_state[state].append((icao, info))
-
-    for state in sorted(by_state.keys()):
-        airports_in_state = by_state[state]
-        print(f"\n{state} ({len(airports_in_state)} airports):")
-        for icao, info in airports_in_state:
-            print(f"  {icao}: {info['name']} - {info['city']}")
+    # Grouped by state, in alphabetical order, printed in one call
+    lines = []
+    for state, airports_in_state in NewEnglandAirports.get_airports_by_state().items():
+        lines.append(f"\n{state} ({len(airports_in_state)} airports):")
+        lines.extend(f"  {icao}: {info['name']} - {info['city']}" for icao, info in airports_in_state)
+    print("\n".join(lines))
 
 async def main():
     """Run all sample examples"""
@@ -168,12 +191,26 @@ async def main():
     sample_airport_database()
     sample_flight_conditions()
 
+    # One METAR client for the weather examples, so they share its
+    # keep-alive connection pool instead of each opening their own
+    client = MetarApiClient()
     try:
-        await sample_basic_usage()
-        await sample_multiple_airports()
-        await sample_lattice_integration()
-    except Exception as e:
-        print(f"\nNote: Some examples require internet connectivity: {e}")
+        # The basic example runs first, so the multiple-airports example
+        # finds its KBOS report in the client's METAR cache. The other two
+        # share no state, so their network calls overlap; the client's
+        # connection limits cap the sockets they open between them
+        results = await asyncio.gather(sample_basic_usage(client), return_exceptions=True)
+        results += await asyncio.gather(
+            sample_multiple_airports(client),
+            sample_lattice_integration(),
+            return_exceptions=True
+        )
+    finally:
+        await client.aclose()
+
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"\nNote: Some examples require internet connectivity: {result}")
 
     print("\n" + "=" * 60)
     print("Sample usage completed!")
@@ -1,62 +1,127 @@
 # Let me create a comprehensive list of New England airports with their ICAO codes
 # based on the information gathered from the search results
 
+import hashlib
+import os
+import sys
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from types import MappingProxyType
+from typing import NamedTuple
+
+class Airport(NamedTuple):
+    """An airport's record; a tuple with named fields instead of a per-airport dict"""
+    name: str
+    city: str
+    state: str
+
 new_england_airports = {
     # Massachusetts
-    "KBOS": {"name": "General Edward Lawrence Logan International Airport", "city": "Boston", "state": "MA"},
-    "KMHT": {"name": "Manchester-Boston Regional Airport", "city": "Manchester", "state": "NH"},
-    "KBDL": {"name": "Bradley International Airport", "city": "Hartford/Windsor Locks", "state": "CT"},
-    "KPVD": {"name": "Theodore Francis Green Airport", "city": "Providence/Warwick", "state": "RI"},
-    "KORH": {"name": "Worcester Regional Airport", "city": "Worcester", "state": "MA"},
-    "KBGR": {"name": "Bangor International Airport", "city": "Bangor", "state": "ME"},
-    "KBTV": {"name": "Patrick Leahy Burlington International Airport", "city": "Burlington", "state": "VT"},
-    "KPWM": {"name": "Portland International Jetport", "city": "Portland", "state": "ME"},
-    "KHVN": {"name": "Tweed New Haven Airport", "city": "New Haven", "state": "CT"},
-    "KACK": {"name": "Nantucket Memorial Airport", "city": "Nantucket", "state": "MA"},
-    "KMVT": {"name": "Martha's Vineyard Airport", "city": "Martha's Vineyard", "state": "MA"},
-    "KHYA": {"name": "Barnstable Municipal Airport", "city": "Hyannis", "state": "MA"},
-    "KPVC": {"name": "Provincetown Municipal Airport", "city": "Provincetown", "state": "MA"},
-    "KGHG": {"name": "Marshfield Municipal Airport", "city": "Marshfield", "state": "MA"},
-    "KOWD": {"name": "Norwood Memorial Airport", "city": "Norwood", "state": "MA"},
-    "KBED": {"name": "Laurence G. Hanscom Field", "city": "Bedford", "state": "MA"},
-    "KEWB": {"name": "New Bedford Regional Airport", "city": "New Bedford", "state": "MA"},
-    "KFMH": {"name": "Otis Air National Guard Base", "city": "Falmouth", "state": "MA"},
-    "KLEB": {"name": "Lebanon Municipal Airport", "city": "Lebanon", "state": "NH"},
-    "KASH": {"name": "Boire Field", "city": "Nashua", "state": "NH"},
-    "KCON": {"name": "Concord Municipal Airport", "city": "Concord", "state": "NH"},
-    "KDAW": {"name": "Rochester Airport", "city": "Rochester", "state": "NH"},
-    "KMPV": {"name": "Edward F. Knapp State Airport", "city": "Montpelier", "state": "VT"},
-    "KRUT": {"name": "Rutland-Southern Vermont Regional Airport", "city": "Rutland", "state": "VT"},
-    "KAUG": {"name": "Augusta State Airport", "city": "Augusta", "state": "ME"},
-    "KRKD": {"name": "Knox County Regional Airport", "city": "Rockland", "state": "ME"},
-    "KBHB": {"name": "Hancock County-Bar Harbor Airport", "city": "Bar Harbor", "state": "ME"},
-    "KPQI": {"name": "Northern Maine Regional Airport", "city": "Presque Isle", "state": "ME"},
-    "KGON": {"name": "Groton-New London Airport", "city": "Groton/New London", "state": "CT"},
-    "KDXR": {"name": "Danbury Municipal Airport", "city": "Danbury", "state": "CT"},
-    "KMMK": {"name": "Meriden Markham Municipal Airport", "city": "Meriden", "state": "CT"},
-    "KUUU": {"name": "Newport State Airport", "city": "Newport", "state": "RI"},
-    "KSFZ": {"name": "North Central State Airport", "city": "Smithfield", "state": "RI"},
+    "KBOS": Airport(name="General Edward Lawrence Logan International Airport", city="Boston", state="MA"),
+    "KMHT": Airport(name="Manchester-Boston Regional Airport", city="Manchester", state="NH"),
+    "KBDL": Airport(name="Bradley International Airport", city="Hartford/Windsor Locks", state="CT"),
+    "KPVD": Airport(name="Theodore Francis Green Airport", city="Providence/Warwick", state="RI"),
+    "KORH": Airport(name="Worcester Regional Airport", city="Worcester", state="MA"),
+    "KBGR": Airport(name="Bangor International Airport", city="Bangor", state="ME"),
+    "KBTV": Airport(name="Patrick Leahy Burlington International Airport", city="Burlington", state="VT"),
+    "KPWM": Airport(name="Portland International Jetport", city="Portland", state="ME"),
+    "KHVN": Airport(name="Tweed New Haven Airport", city="New Haven", state="CT"),
+    "KACK": Airport(name="Nantucket Memorial Airport", city="Nantucket", state="MA"),
+    "KMVT": Airport(name="Martha's Vineyard Airport", city="Martha's Vineyard", state="MA"),
+    "KHYA": Airport(name="Barnstable Municipal Airport", city="Hyannis", state="MA"),
+    "KPVC": Airport(name="Provincetown Municipal Airport", city="Provincetown", state="MA"),
+    "KGHG": Airport(name="Marshfield Municipal Airport", city="Marshfield", state="MA"),
+    "KOWD": Airport(name="Norwood Memorial Airport", city="Norwood", state="MA"),
+    "KBED": Airport(name="Laurence G. Hanscom Field", city="Bedford", state="MA"),
+    "KEWB": Airport(name="New Bedford Regional Airport", city="New Bedford", state="MA"),
+    "KFMH": Airport(name="Otis Air National Guard Base", city="Falmouth", state="MA"),
+    "KLEB": Airport(name="Lebanon Municipal Airport", city="Lebanon", state="NH"),
+    "KASH": Airport(name="Boire Field", city="Nashua", state="NH"),
+    "KCON": Airport(name="Concord Municipal Airport", city="Concord", state="NH"),
+    "KDAW": Airport(name="Rochester Airport", city="Rochester", state="NH"),
+    "KMPV": Airport(name="Edward F. Knapp State Airport", city="Montpelier", state="VT"),
+    "KRUT": Airport(name="Rutland-Southern Vermont Regional Airport", city="Rutland", state="VT"),
+    "KAUG": Airport(name="Augusta State Airport", city="Augusta", state="ME"),
+    "KRKD": Airport(name="Knox County Regional Airport", city="Rockland", state="ME"),
+    "KBHB": Airport(name="Hancock County-Bar Harbor Airport", city="Bar Harbor", state="ME"),
+    "KPQI": Airport(name="Northern Maine Regional Airport", city="Presque Isle", state="ME"),
+    "KGON": Airport(name="Groton-New London Airport", city="Groton/New London", state="CT"),
+    "KDXR": Airport(name="Danbury Municipal Airport", city="Danbury", state="CT"),
+    "KMMK": Airport(name="Meriden Markham Municipal Airport", city="Meriden", state="CT"),
+    "KUUU": Airport(name="Newport State Airport", city="Newport", state="RI"),
+    "KSFZ": Airport(name="North Central State Airport", city="Smithfield", state="RI"),
 }
 
-print("New England Airports ICAO Codes and Information:")
-print("=" * 60)
+# Read-only view of the table for everything below and any importer
+AIRPORTS = MappingProxyType(new_england_airports)
+
+# Column-wise copy of the table: parallel tuples indexed by position, so
+# the loops below walk flat tuples of strings instead of per-airport dicts
+ICAO = tuple(AIRPORTS)
+NAME = tuple(info.name for info in AIRPORTS.values())
+# City and state values repeat across rows; interned, each is one shared object
+CITY = tuple(sys.intern(info.city) for info in AIRPORTS.values())
+STATE = tuple(sys.intern(info.state) for info in AIRPORTS.values())
+
+# Lookup indexes built once at import: every ICAO prefix ("K", "KB", "KBO",
+# "KBOS") to its airports, and each state to its airports
+_PREFIX_INDEX = {}
+for icao in ICAO:
+    for i in range(1, len(icao) + 1):
+        _PREFIX_INDEX.setdefault(icao[:i], []).append(icao)
+
+def find_by_prefix(prefix):
+    """Return the ICAO codes starting with prefix, in listing order"""
+    return _PREFIX_INDEX.get(prefix.upper(), [])
+
+# Group (icao, name, city) rows by state, once; the airport list is static.
+# The rows are sorted by state up front (stably, keeping listing order within
+# a state), so the groups come out in state order and need no sorting later
+_rows_by_state = sorted(zip(STATE, ICAO, NAME, CITY), key=itemgetter(0))
+AIRPORTS_BY_STATE = {
+    state: [(icao, name, city) for _, icao, name, city in rows]
+    for state, rows in groupby(_rows_by_state, key=itemgetter(0))
+}
+_BY_STATE = {state: tuple(icao for icao, _, _ in rows) for state, rows in AIRPORTS_BY_STATE.items()}
+
+def find_by_state(state):
+    """Return the ICAO codes of the airports in a state, in listing order"""
+    return _BY_STATE.get(state.upper(), ())
+
+# Bump whenever build_report() changes its output, so cached reports are rebuilt
+REPORT_VERSION = 1
 
-for icao, info in new_england_airports.items():
-    print(f"{icao}: {info['name']} - {info['city']}, {info['state']}")
+def build_report():
+    """Format the full airport listing, flat and grouped by state, as one string"""
+    lines = ["New England Airports ICAO Codes and Information:", "=" * 60]
+    lines.extend(
+        f"{code}: {name} - {city}, {state}" for code, name, city, state in zip(ICAO, NAME, CITY, STATE)
+    )
+    lines.append(f"\nTotal airports: {len(ICAO)}")
 
-print(f"\nTotal airports: {len(new_england_airports)}")
+    lines.extend(["\nGrouped by State:", "=" * 30])
+    for state, rows in AIRPORTS_BY_STATE.items():
+        lines.append(f"\n{state}:")
+        lines.extend(f"  {icao}: {name} - {city}" for icao, name, city in rows)
+    return "\n".join(lines) + "\n"
 
-# Group by state
-by_state = {}
-for icao, info in new_england_airports.items():
-    state = info['state']
-    if state not in by_state:
-        by_state[state] = []
-    by_state[state].append((icao, info))
+# The report only changes with the airport table and its format, so it is
+# cached in the user's cache directory under a hash of both and reused on
+# later runs
+_report_key = hashlib.blake2b(
+    repr((REPORT_VERSION, sorted(AIRPORTS.items()))).encode(), digest_size=8
+).hexdigest()
+_cache_dir = Path(os.environ.get("XDG_CACHE_HOME") or "~/.cache").expanduser() / "metar-lattice"
+_report_path = _cache_dir / f"airports_{_report_key}.txt"
+try:
+    report = _report_path.read_text(encoding="utf-8")
+except OSError:
+    report = build_report()
+    try:
+        _cache_dir.mkdir(parents=True, exist_ok=True)
+        _report_path.write_text(report, encoding="utf-8")
+    except OSError:
+        pass
 
-print("\nGrouped by State:")
-print("=" * 30)
-for state in sorted(by_state.keys()):
-    print(f"\n{state}:")
-    for icao, info in by_state[state]:
-        print(f"  {icao}: {info['name']} - {info['city']}")
\ No newline at end of file
+sys.stdout.write(report)
\ No newline at end of file
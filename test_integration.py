@@ -5,30 +5,39 @@ Tests the weather data retrieval and parsing functionality without Lattice
 """
 
 import asyncio
+import math
 import sys
 import os
+from collections import defaultdict
 
 # Add the current directory to the path so we can import our modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from metar_lattice_integration import MetarApiClient, NewEnglandAirports, FlightConditions
+from metar_lattice_integration import MetarApiClient, NewEnglandAirports, FlightConditions, _fast_parse_metar
+
+# (visibility miles, ceiling ft, expected flight condition)
+FLIGHT_CONDITION_CASES = (
+    (10.0, 5000, "VFR"),      # Clear conditions
+    (4.0, 2000, "MVFR"),     # Marginal conditions
+    (2.0, 800, "IFR"),       # Instrument conditions
+    (0.5, 300, "LIFR"),      # Low instrument conditions
+)
 
 def test_flight_conditions():
     """Test flight condition classification"""
     print("Testing Flight Condition Classifications:")
     print("-" * 40)
 
-    test_cases = [
-        (10.0, 5000, "VFR"),      # Clear conditions
-        (4.0, 2000, "MVFR"),     # Marginal conditions
-        (2.0, 800, "IFR"),       # Instrument conditions
-        (0.5, 300, "LIFR"),      # Low instrument conditions
-    ]
+    # Every case is classified one at a time and in one batch; both must match
+    visibilities, ceilings, _ = zip(*FLIGHT_CONDITION_CASES)
+    batch_results = FlightConditions.classify_arrays(visibilities, ceilings)
 
-    for visibility, ceiling, expected in test_cases:
+    lines = []
+    for (visibility, ceiling, expected), batch_result in zip(FLIGHT_CONDITION_CASES, batch_results):
         result = FlightConditions.determine_flight_conditions(visibility, ceiling)
-        status = "✓" if result == expected else "✗"
-        print(f"{status} Visibility: {visibility}mi, Ceiling: {ceiling}ft → {result} (expected {expected})")
+        status = "✓" if result == expected and batch_result == expected else "✗"
+        lines.append(f"{status} Visibility: {visibility}mi, Ceiling: {ceiling}ft → {result} (expected {expected})")
+    print("\n".join(lines))
 
 def test_airports():
     """Test airport database"""
@@ -38,16 +47,42 @@ def test_airports():
     airports = NewEnglandAirports.get_airports()
     print(f"Total airports: {len(airports)}")
 
-    # Group by state
-    by_state = {}
-    for icao, info in airports.items():
-        state = info['state']
-        if state not in by_state:
-            by_state[state] = 0
-        by_state[state] += 1
+    # Count airports per state
+    by_state = defaultdict(int)
+    for info in airports.values():
+        by_state[info['state']] += 1
+
+    print("\n".join(f"  {state}: {count} airports" for state, count in sorted(by_state.items())))
+
+# Routine reports the fast METAR parser handles, each checked against python-metar
+METAR_PARSING_CASES = (
+    "KBOS 151254Z 28012KT 10SM FEW050 18/08 A3002 RMK AO2 SLP165 T01780083",
+    "KMHT 151253Z 00000KT 3/4SM BKN008 OVC015 M01/M02 A2992 RMK AO2 T1005",  # no remark dewpoint
+    "KBDL 151251Z 21015G25KT 5SM SCT030 BKN000 15/M01 A2985 RMK T1005",      # no remark dewpoint
+    "KPVD 151251Z AUTO 18006KT 10SM CLR 22/14 A3010 RMK AO2 T02220139",
+)
 
-    for state, count in sorted(by_state.items()):
-        print(f"  {state}: {count} airports")
+def test_metar_parsing():
+    """Test that the fast METAR parser agrees with python-metar"""
+    print("\nTesting METAR Parsing:")
+    print("-" * 22)
+
+    client = MetarApiClient()
+    lines = []
+    for raw_text in METAR_PARSING_CASES:
+        fast = _fast_parse_metar(raw_text)
+        library = client._parse_with_metar_library(raw_text)
+        mismatches = [] if fast is not None else ['not parsed']
+        for field, value in (fast or {}).items():
+            expected = library[field]
+            if isinstance(value, float) and isinstance(expected, float):
+                if not math.isclose(value, expected):
+                    mismatches.append(f"{field} {value} != {expected}")
+            elif value != expected:
+                mismatches.append(f"{field} {value} != {expected}")
+        status = "✓" if not mismatches else "✗"
+        lines.append(f"{status} {raw_text.split()[0]}: {', '.join(mismatches) or 'matches python-metar'}")
+    print("\n".join(lines))
 
 async def test_metar_api():
     """Test METAR API client"""
@@ -60,22 +95,27 @@ async def test_metar_api():
     test_airports = ['KBOS', 'KMHT', 'KBDL']
 
     try:
+        # One batched request for all airports, awaited on the event loop
         print(f"Requesting METAR data for: {', '.join(test_airports)}")
-        metar_data = client.get_metar_data(test_airports)
+        metar_data = await client.get_metar_data_async(test_airports)
 
-        print(f"Received data for {len(metar_data)} airports:")
+        lines = [f"Received data for {len(metar_data)} airports:"]
 
         for icao, data in metar_data.items():
             if 'error' not in data:
                 fc = data.get('flight_condition', 'UNKNOWN')
                 temp = data.get('temperature_c')
                 visibility = data.get('visibility_miles')
-                print(f"  {icao}: {fc}, {temp}°C, {visibility}mi visibility")
+                lines.append(f"  {icao}: {fc}, {temp}°C, {visibility}mi visibility")
             else:
-                print(f"  {icao}: Error - {data['error']}")
+                lines.append(f"  {icao}: Error - {data['error']}")
+
+        print("\n".join(lines))
 
     except Exception as e:
         print(f"Error testing METAR API: {e}")
+    finally:
+        await client.aclose()
 
 def main():
     """Run all tests"""
@@ -84,6 +124,7 @@ def main():
 
     test_flight_conditions()
     test_airports()
+    test_metar_parsing()
 
     # Only run API test if we have internet connectivity
     try: